@@ -1,19 +1,22 @@
 import dash
-from dash import dcc, html, Input, Output, State, callback_context, dash_table
+from dash import dcc, html, Input, Output, State, ctx, dash_table, ClientsideFunction
+from dash.exceptions import PreventUpdate
 import dash_bootstrap_components as dbc
-import plotly.graph_objs as go
-import plotly.express as px
-import pandas as pd
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
+import msgpack
+from flask.json.provider import JSONProvider
 import base64
 import io
-from datetime import datetime, timedelta
-import yagmail
-from reportlab.lib.pagesizes import letter, landscape
-from reportlab.pdfgen import canvas
-from reportlab.lib.utils import ImageReader
-from reportlab.lib.units import inch
+import hashlib
+import os
+from functools import lru_cache
+import threading
+import time
+from cachetools import TTLCache
+from flask_caching import Cache
 import logging
 
 # Configure logging
@@ -23,11 +26,55 @@ logger = logging.getLogger(__name__)
 # API endpoints
 BASE_API_URL = "http://localhost:8000"
 TOURNAMENT_API_URL = "http://localhost:8000/tournament"
+API_TIMEOUT = (1, 5)  # (connect, read) seconds
+
+# When the API runs on this host behind a UNIX domain socket, talk to it over
+# the socket and skip the TCP stack entirely (e.g. API_SOCKET=/tmp/api.sock)
+API_SOCKET = os.getenv("API_SOCKET")
+
+# Shared HTTP session so callbacks reuse keep-alive connections to the API
+_session = requests.Session()
+_session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=32,
+                                      max_retries=Retry(total=2, backoff_factor=0.1)))
+_session.headers["Connection"] = "keep-alive"
+_session.headers["Accept-Encoding"] = "gzip, br"
+# Endpoints that can answer in MessagePack (the leaderboards) will; the rest stay JSON
+_session.headers["Accept"] = "application/msgpack, application/json"
+
+if API_SOCKET:
+    from urllib.parse import quote
+    from requests_unixsocket import UnixAdapter
+
+    _session.mount("http+unix://", UnixAdapter())
+    BASE_API_URL = f"http+unix://{quote(API_SOCKET, safe='')}"
+    TOURNAMENT_API_URL = f"{BASE_API_URL}/tournament"
+
+# Short-lived cache for GET responses so repeated lookups (e.g. /tournaments on
+# every navigation) are served from memory instead of hitting the API again
+API_CACHE_TTL = 10
+_api_cache = TTLCache(maxsize=256, ttl=API_CACHE_TTL)
+_api_cache_lock = threading.Lock()
 
 # Initialize Dash app
-app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP], suppress_callback_exceptions=True)
+app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP],
+                suppress_callback_exceptions=True)
 app.title = "Minigolf Tournament Admin"
 
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+app.server.json = OrjsonProvider(app.server)
+
+# Server-side cache shared by every viewer; entries expire just under the
+# fastest auto-refresh interval so concurrent viewers share one backend fetch
+cache = Cache(app.server, config={"CACHE_TYPE": "SimpleCache", "CACHE_DEFAULT_TIMEOUT": 4})
+
 # Navigation bar
 navbar = dbc.NavbarSimple(
     children=[
@@ -51,6 +98,7 @@ app.layout = dbc.Container([
     html.Div(id="page-content", style={"margin-top": "20px"}),
     dcc.Interval(id="leaderboard-refresh", interval=30000, disabled=True),
     dcc.Store(id="refresh-settings", data={"interval": 30000, "enabled": False}),
+    dcc.Store(id="tournaments-store"),
 ])
 
 # Home page
@@ -235,6 +283,17 @@ def create_leaderboards_page():
                     dbc.Tab(label="Player Leaderboard", tab_id="player-leaderboard"),
                 ], id="leaderboard-tabs", active_tab="team-leaderboard"),
                 html.Div(id="leaderboard-content"),
+                dcc.Store(id="lb-store"),
+                dcc.Store(id="lb-digest"),
+                dcc.Store(id="lb-last-render"),
+                dash_table.DataTable(
+                    id="lb-table",
+                    virtualization=True,
+                    fixed_rows={"headers": True},
+                    page_action="none",
+                    style_table={'height': '600px', 'overflowY': 'auto', 'overflowX': 'auto'},
+                    style_cell={'textAlign': 'left'}
+                ),
             ], width=9),
         ])
     ])
@@ -265,36 +324,102 @@ def create_scorecards_page():
         ])
     ])
 
+# Page layouts carry no per-user state, so build them once and reuse them
+_PAGES = {
+    "/entities": create_entity_page(),
+    "/tournament": create_tournament_page(),
+    "/teams": create_team_management_page(),
+    "/cards": create_cards_page(),
+    "/leaderboards": create_leaderboards_page(),
+    "/scorecards": create_scorecards_page(),
+    "": create_home_page(),
+}
+
 # Utility functions
-def make_api_request(method, endpoint, data=None):
-    """Make API request to the backend services"""
+# Returned in place of data by a conditional GET when the backend answers 304.
+# A string rather than object() so it survives pickling through flask_caching.
+UNCHANGED = "__unchanged__"
+
+def decode_response(response):
+    """Decode a MessagePack or JSON response body according to its Content-Type"""
+    if response.headers.get("Content-Type", "").startswith("application/msgpack"):
+        return msgpack.unpackb(response.content, raw=False)
+    return orjson.loads(response.content)
+
+def make_api_request(method, endpoint, data=None, use_cache=True, etag=None):
+    """Make API request to the backend services
+
+    GET responses are cached for API_CACHE_TTL seconds unless use_cache is False;
+    any write clears the cache.
+
+    Passing etag (use "" when no version is known yet) makes a conditional GET
+    that bypasses the cache and returns a (data, etag) pair instead, with data
+    set to UNCHANGED when the backend reports 304 Not Modified.
+    """
+    conditional = etag is not None
     try:
         url = f"{BASE_API_URL}{endpoint}" if not endpoint.startswith("/tournament") else f"{TOURNAMENT_API_URL}{endpoint[11:]}"
 
         if method.upper() == "GET":
-            response = requests.get(url)
+            key = (endpoint,)
+            use_cache = use_cache and not conditional
+            if use_cache:
+                with _api_cache_lock:
+                    if key in _api_cache:
+                        return _api_cache[key]
+            headers = {"If-None-Match": etag} if etag else None
+            response = _session.get(url, headers=headers, timeout=API_TIMEOUT)
         elif method.upper() == "POST":
-            response = requests.post(url, json=data)
+            response = _session.post(url, json=data, timeout=API_TIMEOUT)
         elif method.upper() == "PUT":
-            response = requests.put(url, json=data)
+            response = _session.put(url, json=data, timeout=API_TIMEOUT)
         elif method.upper() == "DELETE":
-            response = requests.delete(url)
+            response = _session.delete(url, timeout=API_TIMEOUT)
+
+        if method.upper() != "GET":
+            with _api_cache_lock:
+                _api_cache.clear()
+
+        if conditional and response.status_code == 304:
+            return UNCHANGED, etag
 
         if response.status_code in [200, 201]:
-            return response.json()
+            result = decode_response(response)
+            if conditional:
+                return result, response.headers.get("ETag")
+            if method.upper() == "GET" and use_cache:
+                with _api_cache_lock:
+                    _api_cache[key] = result
+            return result
         else:
             logger.error(f"API request failed: {response.status_code} - {response.text}")
-            return None
+            return (None, None) if conditional else None
     except Exception as e:
         logger.error(f"API request error: {e}")
-        return None
+        return (None, None) if conditional else None
+
+@cache.memoize(timeout=4)
+def fetch_leaderboard(tournament_name, kind, etag=""):
+    """Conditionally fetch the team or player leaderboard, shared across viewers for a few seconds
 
-def generate_pdf_card(card_type, data, qr_code_base64):
-    """Generate PDF card with QR code"""
-    buffer = io.BytesIO()
+    Returns (rows, etag); rows is UNCHANGED when the caller's etag is still current.
+    """
+    return make_api_request("GET", f"/tournament/{kind}-leaderboard/{tournament_name}", etag=etag)
+
+@lru_cache(maxsize=256)
+def _qr_reader(qr_code_base64):
+    """Decode a base64 QR PNG once and reuse the ImageReader for identical codes"""
+    from reportlab.lib.utils import ImageReader
+
+    return ImageReader(io.BytesIO(base64.b64decode(qr_code_base64)))
+
+def generate_pdf_card(card_type, data, qr_code_base64, stream):
+    """Generate PDF card with QR code, writing it to stream (a path or binary file object)"""
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.units import inch
 
     # Create PDF with custom size (8.5" x 5.5")
-    c = canvas.Canvas(buffer, pagesize=(8.5*inch, 5.5*inch))
+    c = canvas.Canvas(stream, pagesize=(8.5*inch, 5.5*inch))
 
     # Add title
     c.setFont("Helvetica-Bold", 24)
@@ -307,9 +432,8 @@ def generate_pdf_card(card_type, data, qr_code_base64):
 
     # Add QR code
     if qr_code_base64:
-        qr_image_data = base64.b64decode(qr_code_base64)
-        qr_image = ImageReader(io.BytesIO(qr_image_data))
-        c.drawImage(qr_image, 5.5*inch, 1*inch, width=2.5*inch, height=2.5*inch)
+        c.drawImage(_qr_reader(qr_code_base64), 5.5*inch, 1*inch, width=2.5*inch, height=2.5*inch,
+                    mask='auto', preserveAspectRatio=True)
 
     # Add details
     c.setFont("Helvetica", 12)
@@ -332,85 +456,65 @@ def generate_pdf_card(card_type, data, qr_code_base64):
         c.drawString(0.5*inch, y_pos, f"Location: {data.get('location_name', 'N/A')}")
 
     c.save()
-    buffer.seek(0)
-    return buffer
-
-def generate_scorecard_pdf(team_data, course_data, scores_data):
-    """Generate PDF scorecard for a team"""
-    buffer = io.BytesIO()
-    c = canvas.Canvas(buffer, pagesize=letter)
-
-    # Header
-    c.setFont("Helvetica-Bold", 18)
-    c.drawString(50, 750, f"Scorecard - Team: {team_data.get('name', 'Unknown')}")
-
-    # Course info
-    c.setFont("Helvetica", 12)
-    c.drawString(50, 720, f"Course: {course_data.get('name', 'Unknown')} (Par: {course_data.get('par', 'N/A')})")
-
-    # Table headers
-    c.setFont("Helvetica-Bold", 10)
-    headers = ["Hole", "Name", "Par"] + [f"Player {i+1}" for i in range(4)]
-    x_positions = [50, 100, 150, 200, 250, 300, 350]
-
-    y_pos = 680
-    for i, header in enumerate(headers):
-        if i < len(x_positions):
-            c.drawString(x_positions[i], y_pos, header)
-
-    # Draw table lines
-    c.line(45, y_pos-10, 400, y_pos-10)
-
-    # Table data
-    c.setFont("Helvetica", 9)
-    y_pos -= 25
-
-    for hole_num in range(1, 19):  # 18 holes
-        hole_info = next((h for h in course_data.get('holes', []) if h.get('number') == hole_num), {})
-        c.drawString(x_positions[0], y_pos, str(hole_num))
-        c.drawString(x_positions[1], y_pos, hole_info.get('name', f'Hole {hole_num}'))
-        c.drawString(x_positions[2], y_pos, str(hole_info.get('par', 3)))
-
-        # Player scores
-        for i in range(4):
-            score = scores_data.get(f'hole_{hole_num}_player_{i+1}', '')
-            if i+3 < len(x_positions):
-                c.drawString(x_positions[i+3], y_pos, str(score))
-
-        y_pos -= 15
-        if y_pos < 100:  # New page if needed
-            c.showPage()
-            y_pos = 750
-
-    c.save()
-    buffer.seek(0)
-    return buffer
+    return stream
+
+# Scorecard table layout
+_SCORECARD_HEADERS = ["Hole", "Name", "Par", "Player 1", "Player 2", "Player 3", "Player 4"]
+_SCORECARD_COL_WIDTHS = (50, 50, 50, 50, 50, 50, 50)
+_SCORECARD_HOLES = range(1, 19)  # 18 holes
+_SCORE_KEYS = {n: [f'hole_{n}_player_{i+1}' for i in range(4)] for n in _SCORECARD_HOLES}
+
+def generate_scorecard_pdf(team_data, course_data, scores_data, stream):
+    """Generate PDF scorecard for a team, writing it to stream (a path or binary file object)"""
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, TableStyle
+    from xml.sax.saxutils import escape
+
+    doc = SimpleDocTemplate(stream, pagesize=letter, pageCompression=1)
+    styles = getSampleStyleSheet()
+
+    holes_by_num = {h.get('number'): h for h in course_data.get('holes', [])}
+    rows = [_SCORECARD_HEADERS]
+    for hole_num in _SCORECARD_HOLES:
+        hole_info = holes_by_num.get(hole_num, {})
+        rows.append([str(hole_num), hole_info.get('name', f'Hole {hole_num}'), str(hole_info.get('par', 3)),
+                     *(str(scores_data.get(key, '')) for key in _SCORE_KEYS[hole_num])])
+
+    # Table flowable lays out the grid and paginates on its own, repeating the header row
+    table = Table(rows, colWidths=_SCORECARD_COL_WIDTHS, repeatRows=1, style=TableStyle([
+        ("GRID", (0, 0), (-1, -1), 0.25, colors.black),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, 0), 10),
+        ("FONTSIZE", (0, 1), (-1, -1), 9),
+    ]))
+
+    doc.build([
+        Paragraph(escape(f"Scorecard - Team: {team_data.get('name', 'Unknown')}"), styles["Heading1"]),
+        Paragraph(escape(f"Course: {course_data.get('name', 'Unknown')} (Par: {course_data.get('par', 'N/A')})"), styles["Normal"]),
+        table,
+    ])
+    return stream
 
 # Callbacks
 
-@app.callback(Output("page-content", "children"), [Input("url", "pathname")])
+@app.callback(
+    [Output("page-content", "children"),
+     Output("tournaments-store", "data")],
+    [Input("url", "pathname")]
+)
 def display_page(pathname):
-    if pathname == "/entities":
-        return create_entity_page()
-    elif pathname == "/tournament":
-        return create_tournament_page()
-    elif pathname == "/teams":
-        return create_team_management_page()
-    elif pathname == "/cards":
-        return create_cards_page()
-    elif pathname == "/leaderboards":
-        return create_leaderboards_page()
-    elif pathname == "/scorecards":
-        return create_scorecards_page()
-    else:
-        return create_home_page()
+    # Fetch the tournament list once per navigation; dropdown callbacks read it from the store
+    tournaments = make_api_request("GET", "/tournaments") or []
+
+    return _PAGES.get(pathname, _PAGES[""]), tournaments
 
 @app.callback(
     Output("tournament-dropdown", "options"),
-    [Input("tournament-dropdown", "id")]
+    [Input("tournaments-store", "data")]
 )
-def update_tournament_options(_):
-    tournaments = make_api_request("GET", "/tournaments")
+def update_tournament_options(tournaments):
     if tournaments:
         return [{"label": t["name"], "value": t["name"]} for t in tournaments]
     return []
@@ -436,14 +540,9 @@ def update_tournament_controls(tournament_name):
     [State("tournament-dropdown", "value")]
 )
 def handle_tournament_actions(start_clicks, end_clicks, update_clicks, tournament_name):
-    if not tournament_name:
-        return ""
-
-    ctx = callback_context
-    if not ctx.triggered:
-        return ""
-
-    button_id = ctx.triggered[0]["prop_id"].split(".")[0]
+    button_id = ctx.triggered_id
+    if not button_id or not tournament_name:
+        raise PreventUpdate
 
     if button_id == "start-tournament-btn":
         result = make_api_request("POST", "/tournament/start-tournament", {"tournament_name": tournament_name})
@@ -463,48 +562,73 @@ def handle_tournament_actions(start_clicks, end_clicks, update_clicks, tournamen
 @app.callback(
     [Output("leaderboard-tournament-dropdown", "options"),
      Output("scorecard-tournament-dropdown", "options")],
-    [Input("url", "pathname")]
+    [Input("tournaments-store", "data")]
 )
-def update_all_tournament_dropdowns(pathname):
-    tournaments = make_api_request("GET", "/tournaments")
+def update_all_tournament_dropdowns(tournaments):
     options = []
     if tournaments:
         options = [{"label": t["name"], "value": t["name"]} for t in tournaments]
     return options, options
 
+def leaderboard_digest(kind, tournament_name, data):
+    """Short fingerprint of a leaderboard view, used when the backend sends no ETag"""
+    return hashlib.blake2b(orjson.dumps([kind, tournament_name, data]), digest_size=8).hexdigest()
+
+# Interval ticks landing this soon after the viewer's last render are dropped
+LEADERBOARD_DEBOUNCE = 0.5
+
 @app.callback(
-    Output("leaderboard-content", "children"),
+    [Output("lb-store", "data"),
+     Output("leaderboard-content", "children"),
+     Output("lb-digest", "data"),
+     Output("lb-last-render", "data")],
     [Input("leaderboard-tabs", "active_tab"),
      Input("leaderboard-tournament-dropdown", "value"),
      Input("manual-update-btn", "n_clicks"),
-     Input("leaderboard-refresh", "n_intervals")]
+     Input("leaderboard-refresh", "n_intervals")],
+    [State("lb-digest", "data"),
+     State("lb-last-render", "data")]
 )
-def update_leaderboard_content(active_tab, tournament_name, update_clicks, n_intervals):
+def update_leaderboard_content(active_tab, tournament_name, update_clicks, n_intervals, last_version, last_render):
+    # Only fetches rows here; lb.render decodes them into table data on the client
     if not tournament_name:
-        return html.P("Please select a tournament")
-
-    if active_tab == "team-leaderboard":
-        data = make_api_request("GET", f"/tournament/team-leaderboard/{tournament_name}")
-        if data:
-            df = pd.DataFrame(data)
-            return dash_table.DataTable(
-                data=df.to_dict('records'),
-                columns=[{"name": i, "id": i} for i in df.columns],
-                style_table={'overflowX': 'auto'},
-                style_cell={'textAlign': 'left'}
-            )
-    else:
-        data = make_api_request("GET", f"/tournament/player-leaderboard/{tournament_name}")
-        if data:
-            df = pd.DataFrame(data)
-            return dash_table.DataTable(
-                data=df.to_dict('records'),
-                columns=[{"name": i, "id": i} for i in df.columns],
-                style_table={'overflowX': 'auto'},
-                style_cell={'textAlign': 'left'}
-            )
-
-    return html.P("No data available")
+        return [], html.P("Please select a tournament"), None, None
+
+    kind = "team" if active_tab == "team-leaderboard" else "player"
+    view = f"{kind}:{tournament_name}"
+
+    # Debounce interval ticks only; tab, dropdown and button changes always render.
+    # The last render time lives in this viewer's lb-last-render store, so one
+    # viewer's render never suppresses another viewer's tick.
+    now = time.time()
+    if ctx.triggered_id == "leaderboard-refresh" and now - (last_render or 0) < LEADERBOARD_DEBOUNCE:
+        raise PreventUpdate
+
+    # Only revalidate against the version we already showed for this same view
+    etag = ""
+    if last_version and last_version.get("view") == view:
+        etag = last_version.get("etag") or ""
+
+    data, new_etag = fetch_leaderboard(tournament_name, kind, etag)
+    if data == UNCHANGED:
+        return dash.no_update, dash.no_update, dash.no_update, now
+    if data:
+        new_etag = new_etag or leaderboard_digest(kind, tournament_name, data)
+        if new_etag == etag:
+            return dash.no_update, dash.no_update, dash.no_update, now
+        # Re-packed rather than passed through: the backend may have answered in JSON,
+        # and the rows were already decoded for the digest and the shared cache
+        packed = base64.b64encode(msgpack.packb(data)).decode()
+        return packed, "", {"view": view, "etag": new_etag}, now
+
+    return [], html.P("No data available"), None, now
+
+app.clientside_callback(
+    ClientsideFunction(namespace="lb", function_name="render"),
+    [Output("lb-table", "data"),
+     Output("lb-table", "columns")],
+    [Input("lb-store", "data")]
+)
 
 @app.callback(
     [Output("leaderboard-refresh", "interval"),
@@ -0,0 +1,16 @@
+// Clientside leaderboard rendering: turns the rows held in lb-store into
+// DataTable data/columns without a round trip to the Dash server.
+// Rows arrive as base64-encoded MessagePack and are decoded with the MessagePack decoder in msgpack.js.
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    lb: {
+        render: function(data) {
+            let rows = data || [];
+            if (typeof rows === "string") {
+                const bytes = Uint8Array.from(atob(rows), c => c.charCodeAt(0));
+                rows = MessagePack.decode(bytes);
+            }
+            const columns = Object.keys(rows[0] || {}).map(k => ({name: k, id: k}));
+            return [rows, columns];
+        }
+    }
+});
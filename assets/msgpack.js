@@ -0,0 +1,78 @@
+// Minimal MessagePack decoder for the leaderboard rows in lb-store, served
+// from assets/ so rendering does not depend on a CDN. Covers every type
+// msgpack-python's packb emits for plain data (no ext types).
+window.MessagePack = (function() {
+    const utf8 = new TextDecoder("utf-8");
+
+    function decode(bytes) {
+        const view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+        let pos = 0;
+
+        function str(len) {
+            const s = utf8.decode(bytes.subarray(pos, pos + len));
+            pos += len;
+            return s;
+        }
+        function bin(len) {
+            const b = bytes.slice(pos, pos + len);
+            pos += len;
+            return b;
+        }
+        function array(len) {
+            const out = new Array(len);
+            for (let i = 0; i < len; i++) out[i] = read();
+            return out;
+        }
+        function map(len) {
+            const out = {};
+            for (let i = 0; i < len; i++) {
+                const key = read();
+                out[key] = read();
+            }
+            return out;
+        }
+        function u8() { return view.getUint8(pos++); }
+        function u16() { const v = view.getUint16(pos); pos += 2; return v; }
+        function u32() { const v = view.getUint32(pos); pos += 4; return v; }
+
+        function read() {
+            const t = u8();
+            if (t <= 0x7f) return t;
+            if (t <= 0x8f) return map(t & 0x0f);
+            if (t <= 0x9f) return array(t & 0x0f);
+            if (t <= 0xbf) return str(t & 0x1f);
+            if (t >= 0xe0) return t - 0x100;
+            let v;
+            switch (t) {
+                case 0xc0: return null;
+                case 0xc2: return false;
+                case 0xc3: return true;
+                case 0xc4: return bin(u8());
+                case 0xc5: return bin(u16());
+                case 0xc6: return bin(u32());
+                case 0xca: v = view.getFloat32(pos); pos += 4; return v;
+                case 0xcb: v = view.getFloat64(pos); pos += 8; return v;
+                case 0xcc: return u8();
+                case 0xcd: return u16();
+                case 0xce: return u32();
+                case 0xcf: v = Number(view.getBigUint64(pos)); pos += 8; return v;
+                case 0xd0: v = view.getInt8(pos); pos += 1; return v;
+                case 0xd1: v = view.getInt16(pos); pos += 2; return v;
+                case 0xd2: v = view.getInt32(pos); pos += 4; return v;
+                case 0xd3: v = Number(view.getBigInt64(pos)); pos += 8; return v;
+                case 0xd9: return str(u8());
+                case 0xda: return str(u16());
+                case 0xdb: return str(u32());
+                case 0xdc: return array(u16());
+                case 0xdd: return array(u32());
+                case 0xde: return map(u16());
+                case 0xdf: return map(u32());
+            }
+            throw new Error("Unsupported MessagePack type 0x" + t.toString(16));
+        }
+
+        return read();
+    }
+
+    return {decode: decode};
+})();
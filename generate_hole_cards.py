@@ -7,12 +7,25 @@ tournament API to generate QR codes, then creates 5"x7" PDF cards for each hole.
 """
 
 import os
+import re
 import sys
 import json
 import base64
+import hashlib
+import asyncio
+import httpx
+import qrcode
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    json_loads = json.loads
 import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
 # PDF generation
@@ -20,10 +33,10 @@ from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import inch
 from reportlab.lib.utils import ImageReader
 from reportlab.pdfgen import canvas
+from reportlab.pdfbase.pdfmetrics import stringWidth
 from reportlab.lib.colors import HexColor, black, white
 
 import io
-from PIL import Image
 
 # Configure logging
 logging.basicConfig(
@@ -31,169 +44,518 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
+logging.getLogger('httpx').setLevel(logging.WARNING)  # httpx logs every request at INFO
 
 # API Configuration
 TOURNAMENT_API_BASE = os.getenv('TOURNAMENT_API_BASE', 'http://localhost:8000/tournament')
 ADMIN_API_BASE = os.getenv('ADMIN_API_BASE', 'http://localhost:8002')
 BASE_API = os.getenv('BASE_API', 'http://localhost:8000')
 API_TIMEOUT = 30
+MAX_WORKERS = int(os.getenv('MAX_WORKERS', '16'))  # Concurrent connections to the tournament API
+BATCH_SIZE = 32  # Holes per /generate-hole-cards-batch request
+VECTOR_QR = os.getenv('VECTOR_QR', '1') != '0'  # Draw QR codes locally as vector paths instead of embedding the API's PNG
 
 # PDF Configuration
 CARD_WIDTH = 5 * inch  # 5 inches
 CARD_HEIGHT = 7 * inch  # 7 inches
 MARGIN = 0.25 * inch
 
+# Card colors and fixed text, built once rather than per card
+COURSE_COLORS = {
+    'Black Course': HexColor('#000000'),
+    'Red Course': HexColor('#CC0000'),
+}
+DEFAULT_COURSE_COLOR = HexColor('#2E86AB')  # Blue
+SECONDARY_COLOR = HexColor('#A23B72')  # Purple
+ACCENT_COLOR = HexColor('#666666')  # Orange
+TEXT_COLOR = HexColor('#0B0C10')  # Dark
+QR_LABEL_TEXT = "Scan to load hole information"
+QR_LABEL_WIDTH = stringWidth(QR_LABEL_TEXT, "Helvetica", 10)
+_SAFE_RE = re.compile(r'[^\w \-]+')  # Characters dropped from course names in filenames
+
+@lru_cache(maxsize=None)
+def _get_course_style(course_name):
+    """(primary_color, course name width) for a course; shared by every hole card on that course"""
+    return COURSE_COLORS.get(course_name, DEFAULT_COURSE_COLOR), stringWidth(course_name, "Helvetica-Bold", 16)
+
+def draw_vector_qr(c, payload, x, y, size):
+    """Draw the QR code for payload as filled rectangles, encoded the same way as the tournament API"""
+    qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_L, border=4)
+    qr.add_data(payload)
+    qr.make(fit=True)
+    matrix = qr.get_matrix()  # includes the border
+
+    module = size / len(matrix)
+    path = c.beginPath()
+    for row, cells in enumerate(matrix):
+        top = y + size - (row + 1) * module
+        col = 0
+        # One rectangle per horizontal run of dark modules
+        while col < len(cells):
+            if cells[col]:
+                start = col
+                while col < len(cells) and cells[col]:
+                    col += 1
+                path.rect(x + start * module, top, (col - start) * module, module)
+            else:
+                col += 1
+
+    c.setFillColor(black)
+    c.drawPath(path, fill=1, stroke=0)
+
+def _draw_card(c, hole_data, qr_png, footer_text):
+    """Draw one hole card onto the current page of canvas c"""
+    qr_image_buffer = io.BytesIO(qr_png) if qr_png else None
+    # Locals for everything the drawing code below touches repeatedly
+    cw, ch, m, inch_local = CARD_WIDTH, CARD_HEIGHT, MARGIN, inch
+    course_name = hole_data['course_name']
+    hole_number = hole_data['hole_number']
+    par = hole_data['par']
+    hole_name = hole_data['hole_name']
+    qr_payload = hole_data.get('qr_payload')
+
+    set_fill_color, set_font, draw_string, rect, string_width = (
+        c.setFillColor, c.setFont, c.drawString, c.rect, c.stringWidth)
+
+    # Colors
+    primary_color, course_text_width = _get_course_style(course_name)
+
+    # Background
+    set_fill_color(white)
+    rect(0, 0, cw, ch, fill=1)
+
+    # Header background
+    set_fill_color(primary_color)
+    rect(0, ch - 1.5*inch_local, cw, 1.5*inch_local, fill=1)
+
+    # Course name
+    set_fill_color(white)
+    set_font("Helvetica-Bold", 16)
+    draw_string((cw - course_text_width) / 2, ch - 0.4*inch_local, course_name)
+
+    # Hole name and number - large display
+    set_font("Helvetica-Bold", 36)
+    hole_text = f"{hole_number} - {hole_name}"
+    text_width = string_width(hole_text, "Helvetica-Bold", 36)
+    draw_string((cw - text_width) / 2, ch - 1.2*inch_local, hole_text)
+
+    # Par information
+    set_fill_color(ACCENT_COLOR)
+    par_y = ch - 1.8*inch_local
+    rect(m, par_y - 0.3*inch_local, cw - 2*m, 0.6*inch_local, fill=1)
+
+    set_fill_color(white)
+    set_font("Helvetica-Bold", 24)
+    par_text = f"PAR {par}"
+    text_width = string_width(par_text, "Helvetica-Bold", 24)
+    draw_string((cw - text_width) / 2, par_y - 0.1*inch_local, par_text)
+
+    # QR Code
+    if qr_payload or qr_image_buffer:
+        qr_size = 2.2 * inch_local
+        qr_x = (cw - qr_size) / 2
+        qr_y = 0.8 * inch_local
+        pad = 0.1 * inch_local
+
+        # QR code background
+        set_fill_color(white)
+        rect(qr_x - pad, qr_y - pad, qr_size + 2*pad, qr_size + 2*pad, fill=1)
+        c.setStrokeColor(primary_color)
+        c.setLineWidth(2)
+        rect(qr_x - pad, qr_y - pad, qr_size + 2*pad, qr_size + 2*pad, fill=0)
+
+        # Draw QR code; vector paths when we have the payload, otherwise the API's PNG as an image XObject
+        if qr_payload:
+            draw_vector_qr(c, qr_payload, qr_x, qr_y, qr_size)
+        else:
+            qr_image_buffer.seek(0)
+            c.drawImage(ImageReader(qr_image_buffer), qr_x, qr_y, qr_size, qr_size,
+                        preserveAspectRatio=True, mask='auto')
+
+        # QR code label
+        set_fill_color(TEXT_COLOR)
+        set_font("Helvetica", 10)
+        draw_string((cw - QR_LABEL_WIDTH) / 2, qr_y - 0.3*inch_local, QR_LABEL_TEXT)
+
+
+    # Footer
+    set_fill_color(ACCENT_COLOR)
+    set_font("Helvetica", 8)
+    draw_string(m, 0.2*inch_local, footer_text)
+
+def create_hole_card_pdf(output_dir, hole_data, qr_png, footer_text):
+    """Create a 5x7 inch PDF card for a hole. Module-level so it can run in a worker process."""
+    course_name = hole_data['course_name']
+    hole_number = hole_data['hole_number']
+    try:
+        # Create filename
+        course_safe = _SAFE_RE.sub('', course_name).rstrip()
+        filename = f"hole_card_{course_safe}_hole_{hole_number:02d}.pdf"
+        filepath = output_dir / filename
+
+        # Skip cards whose content hasn't changed since the last run
+        card_key = f"{course_name}|{hole_number}|{hole_data['par']}|{hole_data['hole_name']}|{hole_data.get('qr_payload') or ''}|"
+        digest = hashlib.sha1(card_key.encode() + (qr_png or b'')).hexdigest()
+        hash_path = filepath.with_suffix('.sha1')
+        try:
+            if filepath.exists() and hash_path.read_text() == digest:
+                logger.info(f"Unchanged, keeping existing hole card: {filename}")
+                return filepath
+        except OSError:
+            pass
+
+        # Create PDF canvas
+        c = canvas.Canvas(str(filepath), pagesize=(CARD_WIDTH, CARD_HEIGHT))
+        _draw_card(c, hole_data, qr_png, footer_text)
+
+        # Save PDF
+        c.save()
+        hash_path.write_text(digest)
+        logger.info(f"Created hole card: {filename}")
+        return filepath
+
+    except Exception as e:
+        logger.error(f"Error creating PDF for hole {hole_number}: {e}")
+        return None
+
 class HoleCardGenerator:
-    def __init__(self):
+    def __init__(self, max_workers=MAX_WORKERS, use_cache=True, jobs=None, vector_qr=VECTOR_QR):
         self.output_dir = Path('holecards')
+        self.max_workers = max_workers
+        self.jobs = jobs or os.cpu_count() or 1
+        self.use_cache = use_cache
+        self.vector_qr = vector_qr
+        self._courses_cache = None
+        self._holes_cache = {}
+        # Stamped once per run and handed to the workers, which may have imported this module at a different minute
+        self._footer_text = f"Generated: {datetime.now():%Y-%m-%d %H:%M} via API"
         self.tournament_api = TOURNAMENT_API_BASE
         self.admin_api = ADMIN_API_BASE
         self.base_api = BASE_API
+        self.session = self.create_session()
         self.setup_api_connections()
         self.setup_output_directory()
 
+    def create_session(self):
+        """Create a pooled HTTP session so requests reuse keep-alive connections"""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
     def setup_api_connections(self):
-        """Test connections to both APIs"""
-        # Test tournament API
-        try:
-            response = requests.get(f'{self.tournament_api}/health', timeout=5)
-            if response.status_code == 200:
-                logger.info(f"Successfully connected to tournament API at {self.tournament_api}")
-            else:
-                logger.warning(f"Tournament API responded with status {response.status_code}")
-        except Exception as e:
-            logger.error(f"Failed to connect to tournament API: {e}")
-            logger.error(f"Make sure tournament_app.py is running at {self.tournament_api}")
-            sys.exit(1)
+        """Test connections to both APIs, concurrently; set SKIP_HEALTHCHECK=1 to skip"""
+        if os.getenv('SKIP_HEALTHCHECK'):
+            logger.info("SKIP_HEALTHCHECK set, not checking API connections")
+            return
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            tournament_ok = executor.submit(self.check_api, "tournament", f'{self.tournament_api}/health', "tournament_app.py", self.tournament_api)
+            admin_ok = executor.submit(self.check_api, "admin", f'{self.admin_api}/', "admin_web_app.py", self.admin_api)
+            if not (tournament_ok.result() and admin_ok.result()):
+                sys.exit(1)
 
-        # Test admin API
+    def check_api(self, name, url, app_file, base_url):
+        """Check one API is reachable. Returns False if it can't be reached at all."""
         try:
-            response = requests.get(f'{self.admin_api}/', timeout=5)
+            response = self.session.get(url, timeout=5)
             if response.status_code == 200:
-                logger.info(f"Successfully connected to admin API at {self.admin_api}")
+                logger.info(f"Successfully connected to {name} API at {base_url}")
             else:
-                logger.warning(f"Admin API responded with status {response.status_code}")
+                logger.warning(f"{name.capitalize()} API responded with status {response.status_code}")
+            return True
         except Exception as e:
-            logger.error(f"Failed to connect to admin API: {e}")
-            logger.error(f"Make sure admin_web_app.py is running at {self.admin_api}")
-            sys.exit(1)
+            logger.error(f"Failed to connect to {name} API: {e}")
+            logger.error(f"Make sure {app_file} is running at {base_url}")
+            return False
 
     def setup_output_directory(self):
         """Create output directory if it doesn't exist"""
         self.output_dir.mkdir(exist_ok=True)
+        if self.use_cache:
+            (self.output_dir / '.qrcache').mkdir(exist_ok=True)
         logger.info(f"Output directory: {self.output_dir.absolute()}")
 
-    def get_courses_from_admin_api(self):
-        """Get list of all courses from admin web app API"""
+    def get_courses_from_admin_api(self, refresh=False):
+        """Get list of all courses from admin web app API, cached for the run unless refresh=True"""
+        if self._courses_cache is not None and not refresh:
+            return self._courses_cache
+
         try:
-            response = requests.get(f'{self.base_api}/courses', timeout=API_TIMEOUT)
+            response = self.session.get(f'{self.base_api}/courses', timeout=API_TIMEOUT)
 
             if response.status_code == 200:
-                courses_data = response.json()
+                courses_data = json_loads(response.content)
                 logger.info(f"Retrieved {len(courses_data)} courses from admin API")
+                self._courses_cache = courses_data
                 return courses_data
             else:
                 logger.error(f"Admin API returned status {response.status_code} for courses")
                 return []
 
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError) as e:
             logger.error(f"Error getting courses from admin API: {e}")
             return []
 
-    def get_course_holes_from_admin_api(self, course_name):
-        """Get holes for a specific course from admin API"""
+    def get_course_holes_from_admin_api(self, course_name, refresh=False):
+        """Get holes for a specific course from admin API, cached for the run unless refresh=True"""
+        if course_name in self._holes_cache and not refresh:
+            return self._holes_cache[course_name]
+
         try:
-            response = requests.get(
+            response = self.session.get(
                 f'{self.base_api}/courses/{course_name}/holes',
                 timeout=API_TIMEOUT
             )
 
             if response.status_code == 200:
-                holes_data = response.json()
+                holes_data = json_loads(response.content)
                 logger.info(f"Retrieved {len(holes_data)} holes for course {course_name}")
+                self._holes_cache[course_name] = holes_data
                 return holes_data
             else:
                 logger.warning(f"Admin API returned status {response.status_code} for {course_name} holes")
                 return []
 
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError) as e:
             logger.error(f"Error getting holes for {course_name} from admin API: {e}")
             return []
 
-    def get_all_holes_from_apis(self):
+    def get_all_holes_from_apis(self, on_hole=None):
         """Get all holes from all courses using both admin and tournament APIs"""
-        all_holes = []
-
         # Get courses from admin API
         courses = self.get_courses_from_admin_api()
         if not courses:
             logger.error("No courses found from admin API")
             return []
 
-        # Process each course
-        for course in courses:
-            course_name = course.get('name', course.get('course_name', 'Unknown'))
-            logger.info(f"Processing course: {course_name}")
+        course_names = [course.get('name', course.get('course_name', 'Unknown')) for course in courses]
+        all_holes = self.collect_course_holes(course_names, on_hole)
+
+        logger.info(f"Successfully processed {len(all_holes)} holes total")
+        return all_holes
+
+    def collect_course_holes(self, course_names, on_hole=None):
+        """
+        Get hole data and QR codes for the given courses, fetching concurrently.
+        on_hole, if given, is called with each hole's data as soon as its QR code is available.
+        """
+        return asyncio.run(self._collect_all(course_names, on_hole))
+
+    async def _collect_all(self, course_names, on_hole=None):
+        """Fetch every course's hole list, then all QR codes, on one event loop"""
+        all_holes = []
 
-            # Get holes for this course from admin API
-            course_holes = self.get_course_holes_from_admin_api(course_name)
+        def add_hole(item, qr_buffer, detailed_hole_data):
+            hole_data = self.add_hole(all_holes, item, qr_buffer, detailed_hole_data)
+            if hole_data and on_hole:
+                on_hole(hole_data)
+
+        # A course or hole named twice would be fetched twice and race to write the same PDF.
+        # Dropping repeats here means every QR code request that goes out is unique.
+        course_names = list(dict.fromkeys(course_names))
+        seen = set()
+
+        # Hole lists for every course first; the admin API helpers are blocking (and cached), so run them in threads
+        course_holes_list = await asyncio.gather(
+            *(asyncio.to_thread(self.get_course_holes_from_admin_api, course_name) for course_name in course_names)
+        )
+
+        pending = []
+        for course_name, course_holes in zip(course_names, course_holes_list):
+            logger.info(f"Processing course: {course_name}")
 
             if not course_holes:
                 logger.warning(f"No holes found for course {course_name}")
                 continue
 
-            # Generate hole cards for each hole
             for hole_info in course_holes:
                 hole_number = hole_info.get('number', hole_info.get('hole_number', 1))
+                item = (course_name, hole_number, hole_info)
 
-                try:
-                    # Get QR code and detailed hole data from tournament API
-                    qr_buffer, detailed_hole_data = self.generate_qr_code_from_tournament_api(
-                        course_name, hole_number
-                    )
-
-                    if qr_buffer and detailed_hole_data:
-                        # Combine admin API data with tournament API data
-                        combined_hole_data = {
-                            'course_name': course_name,
-                            'hole_number': hole_number,
-                            'par': detailed_hole_data.get('par', hole_info.get('par', 4)),
-                            'hole_name': detailed_hole_data.get('hole_name', hole_info.get('name', f"Hole {hole_number}")),
-                            'qr_code_buffer': qr_buffer
-                        }
-                        all_holes.append(combined_hole_data)
-                        logger.info(f"Successfully processed {course_name} - Hole {hole_number}")
-                    else:
-                        logger.warning(f"Could not get QR code for {course_name} hole {hole_number}")
+                if (course_name, hole_number) in seen:
+                    logger.info(f"Skipping duplicate {course_name} hole {hole_number}")
+                    continue
+                seen.add((course_name, hole_number))
+
+                cached = self.load_cached_qr(item) if self.use_cache else None
+                if cached:
+                    add_hole(item, *cached)
+                else:
+                    pending.append(item)
 
+        if all_holes:
+            logger.info(f"Loaded {len(all_holes)} QR codes from cache")
+
+        transport = httpx.AsyncHTTPTransport(
+            http2=True,
+            limits=httpx.Limits(max_connections=self.max_workers),
+            retries=2
+        )
+        async with httpx.AsyncClient(transport=transport, timeout=API_TIMEOUT) as client:
+            async def fetch_batch(batch):
+                return batch, await self.generate_qr_codes_batch(client, [item[:2] for item in batch])
+
+            async def fetch_single(item):
+                try:
+                    return item, await self.generate_qr_code_from_tournament_api(client, *item[:2])
                 except Exception as e:
-                    logger.error(f"Error processing {course_name} hole {hole_number}: {e}")
+                    logger.error(f"Error processing {item[0]} hole {item[1]}: {e}")
+                    return item, (None, None)
+
+            # QR codes in batches, all batches in flight at once and handled as each one lands
+            batches = [pending[i:i + BATCH_SIZE] for i in range(0, len(pending), BATCH_SIZE)]
+
+            single = []
+            for next_batch in asyncio.as_completed([fetch_batch(batch) for batch in batches]):
+                batch, results = await next_batch
+                if results is None:
+                    # Tournament API without the batch endpoint; fetch these holes one at a time
+                    single.extend(batch)
                     continue
 
-        logger.info(f"Successfully processed {len(all_holes)} holes total")
+                for item, (qr_buffer, detailed_hole_data) in zip(batch, results):
+                    self.store_cached_qr(item, qr_buffer, detailed_hole_data)
+                    add_hole(item, qr_buffer, detailed_hole_data)
+
+            for next_single in asyncio.as_completed([fetch_single(item) for item in single]):
+                item, (qr_buffer, detailed_hole_data) = await next_single
+                self.store_cached_qr(item, qr_buffer, detailed_hole_data)
+                add_hole(item, qr_buffer, detailed_hole_data)
+
         return all_holes
 
-    def generate_qr_code_from_tournament_api(self, course_name, hole_number):
+    def _qr_cache_path(self, item):
+        """Cache file for a hole's QR code, keyed by course, hole number and the admin API hole metadata"""
+        course_name, hole_number, hole_info = item
+        key = f"{course_name}|{hole_number}|{json.dumps(hole_info, sort_keys=True, default=str)}"
+        return self.output_dir / '.qrcache' / f"{hashlib.sha1(key.encode()).hexdigest()}.png"
+
+    def load_cached_qr(self, item):
+        """Return (qr_buffer, hole_info) from the on-disk QR cache, or None on a miss. qr_buffer is None if only hole data was cached."""
+        png_path = self._qr_cache_path(item)
+        try:
+            hole_info = json.loads(png_path.with_suffix('.json').read_text())
+        except (OSError, ValueError):
+            return None
+
+        try:
+            qr_image_buffer = io.BytesIO(png_path.read_bytes())
+        except OSError:
+            # Vector QR codes only need the hole data
+            if not self.vector_qr:
+                return None
+            qr_image_buffer = None
+        return qr_image_buffer, hole_info
+
+    def store_cached_qr(self, item, qr_buffer, hole_info):
+        """Write a freshly fetched QR code and its hole data to the on-disk cache"""
+        if not (self.use_cache and hole_info):
+            return
+        png_path = self._qr_cache_path(item)
+        try:
+            # JSON sidecar last so a partial write never looks like a cache hit
+            if qr_buffer:
+                png_path.write_bytes(qr_buffer.getvalue())
+            png_path.with_suffix('.json').write_text(json.dumps(hole_info))
+        except OSError as e:
+            logger.warning(f"Could not cache QR code for {item[0]} hole {item[1]}: {e}")
+
+    def add_hole(self, all_holes, item, qr_buffer, detailed_hole_data):
+        """Combine admin API data with tournament API data and append it to all_holes. Returns the combined data, or None."""
+        course_name, hole_number, hole_info = item
+
+        if detailed_hole_data and (qr_buffer or self.vector_qr):
+            combined_hole_data = {
+                'course_name': course_name,
+                'hole_number': hole_number,
+                'par': detailed_hole_data.get('par', hole_info.get('par', 4)),
+                'hole_name': detailed_hole_data.get('hole_name', hole_info.get('name', f"Hole {hole_number}")),
+                # Same JSON the tournament API encodes, so the card can draw the QR code itself
+                'qr_payload': json.dumps(detailed_hole_data) if self.vector_qr else None,
+                'qr_code_buffer': qr_buffer
+            }
+            all_holes.append(combined_hole_data)
+            logger.info(f"Successfully processed {course_name} - Hole {hole_number}")
+            return combined_hole_data
+        else:
+            logger.warning(f"Could not get QR code for {course_name} hole {hole_number}")
+            return None
+
+    async def generate_qr_codes_batch(self, client, items):
+        """
+        Get QR codes and hole data for many (course_name, hole_number) pairs in one tournament API call.
+        Returns a list of (qr_buffer, hole_info) aligned with items, or None if the batch endpoint isn't available.
+        """
+        try:
+            response = await client.post(
+                f'{self.tournament_api}/generate-hole-cards-batch',
+                json={'requests': [{'course_name': course_name, 'hole_number': hole_number}
+                                   for course_name, hole_number in items],
+                      # Vector QR codes are drawn from encoded_data, so skip the PNGs
+                      'include_qr_image': not self.vector_qr},
+                timeout=API_TIMEOUT
+            )
+
+            if response.status_code == 404:
+                return None
+
+            if response.status_code != 200:
+                logger.error(f"Tournament API error {response.status_code} for batch of {len(items)} holes")
+                if response.text:
+                    logger.error(f"Response: {response.text}")
+                return [(None, None)] * len(items)
+
+            # Missing holes are left out of the response, so match results back by course and hole
+            cards = {}
+            for data in json_loads(response.content):
+                hole_info = data['encoded_data']
+                qr_base64 = data.get('qr_code_base64')
+                qr_image_buffer = io.BytesIO(base64.b64decode(qr_base64)) if qr_base64 else None
+                cards[(hole_info['course_name'], hole_info['hole_number'])] = (qr_image_buffer, hole_info)
+
+            return [cards.get(tuple(item), (None, None)) for item in items]
+
+        except httpx.HTTPError as e:
+            logger.error(f"Network error getting QR codes for batch of {len(items)} holes: {e}")
+            return [(None, None)] * len(items)
+        except Exception as e:
+            logger.error(f"Unexpected error getting QR codes for batch of {len(items)} holes: {e}")
+            return [(None, None)] * len(items)
+
+    async def generate_qr_code_from_tournament_api(self, client, course_name, hole_number):
         """Get QR code and hole data from tournament API"""
         try:
             # Use the correct endpoint format for the tournament API
-            response = requests.post(
+            response = await client.post(
                 f'{self.tournament_api}/generate-hole-card',  # Note the dash, not underscore
                 json={
                     'course_name': course_name,
-                    'hole_number': hole_number
+                    'hole_number': hole_number,
+                    # Vector QR codes are drawn from encoded_data, so skip the PNG
+                    'include_qr_image': not self.vector_qr
                 },
-                headers={'Content-Type': 'application/json'},
+                # Ask for the PNG itself; older tournament APIs ignore this and answer with base64 JSON
+                headers={'Content-Type': 'application/json',
+                         'Accept': 'application/json' if self.vector_qr else 'image/png, application/json'},
                 timeout=API_TIMEOUT
             )
 
+            if response.status_code == 200 and response.headers.get('Content-Type', '').startswith('image/png'):
+                return io.BytesIO(response.content), json_loads(response.headers['X-Encoded-Data'])
+
             if response.status_code == 200:
-                data = response.json()
+                data = json_loads(response.content)
 
                 if 'qr_code_base64' in data and 'encoded_data' in data:
-                    # Decode base64 QR code image
-                    qr_image_data = base64.b64decode(data['qr_code_base64'])
-                    qr_image_buffer = io.BytesIO(qr_image_data)
+                    # Decode base64 QR code image (empty when include_qr_image was off)
+                    qr_base64 = data['qr_code_base64']
+                    qr_image_buffer = io.BytesIO(base64.b64decode(qr_base64)) if qr_base64 else None
 
                     # Parse hole data from encoded_data
                     hole_info = data['encoded_data']
@@ -208,7 +570,7 @@ class HoleCardGenerator:
                     logger.error(f"Response: {response.text}")
                 return None, None
 
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Network error getting QR code for {course_name} hole {hole_number}: {e}")
             return None, None
         except json.JSONDecodeError as e:
@@ -218,151 +580,81 @@ class HoleCardGenerator:
             logger.error(f"Unexpected error getting QR code for {course_name} hole {hole_number}: {e}")
             return None, None
 
-    def get_specific_courses_holes(self, course_names):
+    def get_specific_courses_holes(self, course_names, on_hole=None):
         """Get holes for specific courses only"""
-        all_holes = []
-
-        for course_name in course_names:
-            logger.info(f"Processing specified course: {course_name}")
+        all_holes = self.collect_course_holes(course_names, on_hole)
 
-            # Get holes for this course from admin API
-            course_holes = self.get_course_holes_from_admin_api(course_name)
-
-            if not course_holes:
-                logger.warning(f"No holes found for course {course_name}")
-                continue
-
-            # Generate hole cards for each hole
-            for hole_info in course_holes:
-                hole_number = hole_info.get('number', hole_info.get('hole_number', 1))
+        logger.info(f"Successfully processed {len(all_holes)} holes for specified courses")
+        return all_holes
 
+    def render_cards(self, fetch_holes):
+        """
+        Run fetch_holes(on_hole=...) and render each hole's PDF as soon as its QR code arrives,
+        across self.jobs worker processes. Returns (holes, successful, failed).
+        """
+        executor_class = ProcessPoolExecutor if self.jobs > 1 else ThreadPoolExecutor
+        with executor_class(max_workers=self.jobs) as executor:
+            futures = []
+
+            def on_hole(hole_data):
+                # Plain dict and PNG bytes so the task pickles cleanly to the worker processes
+                card_data = {k: v for k, v in hole_data.items() if k != 'qr_code_buffer'}
+                qr_buffer = hole_data['qr_code_buffer']
+                qr_png = qr_buffer.getvalue() if qr_buffer else None
+                futures.append(executor.submit(create_hole_card_pdf, self.output_dir, card_data, qr_png, self._footer_text))
+
+            logger.info(f"Creating PDFs with {self.jobs} worker(s) as QR codes arrive")
+            holes = fetch_holes(on_hole=on_hole)
+
+            successful = failed = 0
+            for future in futures:
                 try:
-                    # Get QR code and detailed hole data from tournament API
-                    qr_buffer, detailed_hole_data = self.generate_qr_code_from_tournament_api(
-                        course_name, hole_number
-                    )
-
-                    if qr_buffer and detailed_hole_data:
-                        # Combine admin API data with tournament API data
-                        combined_hole_data = {
-                            'course_name': course_name,
-                            'hole_number': hole_number,
-                            'par': detailed_hole_data.get('par', hole_info.get('par', 4)),
-                            'hole_name': detailed_hole_data.get('hole_name', hole_info.get('name', f"Hole {hole_number}")),
-                            'qr_code_buffer': qr_buffer
-                        }
-                        all_holes.append(combined_hole_data)
-                        logger.info(f"Successfully processed {course_name} - Hole {hole_number}")
-                    else:
-                        logger.warning(f"Could not get QR code for {course_name} hole {hole_number}")
-
+                    pdf_path = future.result()
                 except Exception as e:
-                    logger.error(f"Error processing {course_name} hole {hole_number}: {e}")
-                    continue
+                    logger.error(f"Error creating PDF: {e}")
+                    pdf_path = None
 
-        logger.info(f"Successfully processed {len(all_holes)} holes for specified courses")
-        return all_holes
+                if pdf_path:
+                    successful += 1
+                else:
+                    failed += 1
+
+        return holes, successful, failed
 
-    def create_hole_card_pdf(self, hole_data, qr_image_buffer):
-        """Create a 5x7 inch PDF card for a hole"""
+    def create_combined_pdf(self, holes, path):
+        """Draw every hole card as a page of one PDF at path. Returns the path, or None on failure."""
         try:
-            # Create filename
-            course_safe = "".join(c for c in hole_data['course_name'] if c.isalnum() or c in (' ', '-', '_')).rstrip()
-            filename = f"hole_card_{course_safe}_hole_{hole_data['hole_number']:02d}.pdf"
-            filepath = self.output_dir / filename
-
-            # Create PDF canvas
-            c = canvas.Canvas(str(filepath), pagesize=(CARD_WIDTH, CARD_HEIGHT))
-
-            # Colors
-            if hole_data['course_name']=='Black Course':
-                primary_color = HexColor('#000000')
-            elif hole_data['course_name']=='Red Course':
-                primary_color = HexColor('#CC0000')
-            else:
-                primary_color = HexColor('#2E86AB')  # Blue
-            secondary_color = HexColor('#A23B72')  # Purple
-            accent_color = HexColor('#666666')  # Orange
-            text_color = HexColor('#0B0C10')  # Dark
-
-            # Background
-            c.setFillColor(white)
-            c.rect(0, 0, CARD_WIDTH, CARD_HEIGHT, fill=1)
-
-            # Header background
-            c.setFillColor(primary_color)
-            c.rect(0, CARD_HEIGHT - 1.5*inch, CARD_WIDTH, 1.5*inch, fill=1)
-
-            # Course name
-            c.setFillColor(white)
-            c.setFont("Helvetica-Bold", 16)
-            course_text = hole_data['course_name']
-            text_width = c.stringWidth(course_text, "Helvetica-Bold", 16)
-            c.drawString((CARD_WIDTH - text_width) / 2, CARD_HEIGHT - 0.4*inch, course_text)
-
-            # Hole name and number - large display
-            c.setFont("Helvetica-Bold", 36)
-            hole_text = f"{hole_data['hole_number']} - {hole_data['hole_name']}"
-            text_width = c.stringWidth(hole_text, "Helvetica-Bold", 36)
-            c.drawString((CARD_WIDTH - text_width) / 2, CARD_HEIGHT - 1.2*inch, hole_text)
-
-            # Par information
-            c.setFillColor(accent_color)
-            par_y = CARD_HEIGHT - 1.8*inch
-            c.rect(MARGIN, par_y - 0.3*inch, CARD_WIDTH - 2*MARGIN, 0.6*inch, fill=1)
-
-            c.setFillColor(white)
-            c.setFont("Helvetica-Bold", 24)
-            par_text = f"PAR {hole_data['par']}"
-            text_width = c.stringWidth(par_text, "Helvetica-Bold", 24)
-            c.drawString((CARD_WIDTH - text_width) / 2, par_y - 0.1*inch, par_text)
-
-            # QR Code
-            if qr_image_buffer:
-                qr_size = 2.2 * inch
-                qr_x = (CARD_WIDTH - qr_size) / 2
-                qr_y = 0.8 * inch
-
-                # QR code background
-                c.setFillColor(white)
-                c.rect(qr_x - 0.1*inch, qr_y - 0.1*inch, qr_size + 0.2*inch, qr_size + 0.2*inch, fill=1)
-                c.setStrokeColor(primary_color)
-                c.setLineWidth(2)
-                c.rect(qr_x - 0.1*inch, qr_y - 0.1*inch, qr_size + 0.2*inch, qr_size + 0.2*inch, fill=0)
-
-                image = Image.open(qr_image_buffer)
-                # Draw QR code
-                c.drawInlineImage(image, qr_x, qr_y, qr_size, qr_size)
-
-                # QR code label
-                c.setFillColor(text_color)
-                c.setFont("Helvetica", 10)
-                label_text = "Scan to load hole information"
-                text_width = c.stringWidth(label_text, "Helvetica", 10)
-                c.drawString((CARD_WIDTH - text_width) / 2, qr_y - 0.3*inch, label_text)
-
-
-            # Footer
-            c.setFillColor(HexColor('#666666'))
-            c.setFont("Helvetica", 8)
-            footer_text = f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')} via API"
-            c.drawString(MARGIN, 0.2*inch, footer_text)
-
-            # Save PDF
+            c = canvas.Canvas(str(path), pagesize=(CARD_WIDTH, CARD_HEIGHT))
+            for hole_data in sorted(holes, key=lambda h: (h['course_name'], h['hole_number'])):
+                qr_buffer = hole_data['qr_code_buffer']
+                _draw_card(c, hole_data, qr_buffer.getvalue() if qr_buffer else None, self._footer_text)
+                c.showPage()
             c.save()
-            logger.info(f"Created hole card: {filename}")
-            return filepath
+            logger.info(f"Created combined hole cards: {path}")
+            return path
 
         except Exception as e:
-            logger.error(f"Error creating PDF for hole {hole_data['hole_number']}: {e}")
+            logger.error(f"Error creating combined PDF {path}: {e}")
             return None
 
-    def generate_all_cards(self):
-        """Generate hole cards for all holes using both admin and tournament APIs"""
+    def render_combined(self, holes, path):
+        """create_combined_pdf with the (successful, failed) tally used by the generate_* methods"""
+        if not holes:
+            return 0, 0
+        if self.create_combined_pdf(holes, path):
+            return len(holes), 0
+        return 0, len(holes)
+
+    def generate_all_cards(self, combined=None):
+        """Generate hole cards for all holes using both admin and tournament APIs; combined writes one multi-page PDF there instead"""
         logger.info("Starting hole card generation using admin and tournament APIs...")
 
-        # Get all holes from all courses
-        holes = self.get_all_holes_from_apis()
+        if combined:
+            holes = self.get_all_holes_from_apis()
+            successful, failed = self.render_combined(holes, combined)
+        else:
+            # Get all holes from all courses, rendering cards while the rest are fetched
+            holes, successful, failed = self.render_cards(self.get_all_holes_from_apis)
 
         if not holes:
             logger.error("No holes found via APIs. Please check:")
@@ -372,72 +664,27 @@ class HoleCardGenerator:
             logger.error("4. API endpoints are working correctly")
             return
 
-        successful = 0
-        failed = 0
-
-        for hole_data in holes:
-            try:
-                logger.info(f"Creating PDF for {hole_data['course_name']} - Hole {hole_data['hole_number']}")
-
-                # Use QR code buffer from hole data
-                qr_image_buffer = hole_data.get('qr_code_buffer')
-
-                if not qr_image_buffer:
-                    logger.warning(f"No QR code available for {hole_data['course_name']} hole {hole_data['hole_number']}")
-                    failed += 1
-                    continue
-
-                # Create PDF
-                pdf_path = self.create_hole_card_pdf(hole_data, qr_image_buffer)
-                if pdf_path:
-                    successful += 1
-                else:
-                    failed += 1
-
-            except Exception as e:
-                logger.error(f"Error processing hole {hole_data['hole_number']}: {e}")
-                failed += 1
-
         logger.info(f"Hole card generation complete!")
         logger.info(f"Successfully created: {successful} cards")
         logger.info(f"Failed: {failed} cards")
         logger.info(f"Output directory: {self.output_dir.absolute()}")
 
-    def generate_specific_cards(self, course_names):
-        """Generate cards for specific courses only"""
+    def generate_specific_cards(self, course_names, combined=None):
+        """Generate cards for specific courses only; combined writes one multi-page PDF there instead"""
         logger.info(f"Generating cards for specific courses: {', '.join(course_names)}")
 
-        holes = self.get_specific_courses_holes(course_names)
+        if combined:
+            holes = self.get_specific_courses_holes(course_names)
+            successful, failed = self.render_combined(holes, combined)
+        else:
+            holes, successful, failed = self.render_cards(
+                lambda on_hole: self.get_specific_courses_holes(course_names, on_hole)
+            )
 
         if not holes:
             logger.error("No holes found for specified courses")
             return
 
-        successful = 0
-        failed = 0
-
-        for hole_data in holes:
-            try:
-                logger.info(f"Creating PDF for {hole_data['course_name']} - Hole {hole_data['hole_number']}")
-
-                # Use QR code buffer from hole data
-                qr_image_buffer = hole_data.get('qr_code_buffer')
-
-                if not qr_image_buffer:
-                    failed += 1
-                    continue
-
-                # Create PDF
-                pdf_path = self.create_hole_card_pdf(hole_data, qr_image_buffer)
-                if pdf_path:
-                    successful += 1
-                else:
-                    failed += 1
-
-            except Exception as e:
-                logger.error(f"Error processing hole {hole_data['hole_number']}: {e}")
-                failed += 1
-
         logger.info(f"Specific hole card generation complete!")
         logger.info(f"Successfully created: {successful} cards")
         logger.info(f"Failed: {failed} cards")
@@ -459,22 +706,50 @@ class HoleCardGenerator:
             return []
 
     def close(self):
-        """Cleanup (no database connection to close)"""
-        pass
+        """Close the HTTP session"""
+        self.session.close()
+
+def pop_option(args, flag, description):
+    """Remove flag and its value from args and return the value, or None if flag isn't present"""
+    if flag not in args:
+        return None
+    i = args.index(flag)
+    if i + 1 >= len(args):
+        logger.error(f"Please specify {description} after {flag}")
+        sys.exit(1)
+    value = args[i + 1]
+    del args[i:i + 2]
+    return value
 
 def main():
     """Main function"""
     try:
-        generator = HoleCardGenerator()
+        args = sys.argv[1:]
+        use_cache = '--no-cache' not in args
+        args = [arg for arg in args if arg != '--no-cache']
+
+        jobs = pop_option(args, '--jobs', "a number of worker processes")
+        try:
+            jobs = int(jobs) if jobs else None
+        except ValueError:
+            logger.error("Please specify a number of worker processes after --jobs")
+            sys.exit(1)
+
+        combined = pop_option(args, '--combined', "an output PDF path")
+
+        generator = HoleCardGenerator(use_cache=use_cache, jobs=jobs)
 
         # Check for command line arguments
-        if len(sys.argv) > 1:
-            if sys.argv[1] == '--help' or sys.argv[1] == '-h':
+        if args:
+            if args[0] == '--help' or args[0] == '-h':
                 print("Hole Card Generator")
                 print("Usage:")
                 print("  python generate_hole_cards.py                    # Generate cards for all courses")
                 print("  python generate_hole_cards.py --list-courses     # List available courses")
                 print("  python generate_hole_cards.py --courses [names]  # Generate cards for specific courses")
+                print("  python generate_hole_cards.py --no-cache         # Refetch QR codes instead of using holecards/.qrcache")
+                print("  python generate_hole_cards.py --jobs N           # Render PDFs with N processes (default: CPU count)")
+                print("  python generate_hole_cards.py --combined PATH    # Write all cards as pages of one PDF at PATH")
                 print("  python generate_hole_cards.py --help             # Show this help")
                 print()
                 print("Examples:")
@@ -486,7 +761,7 @@ def main():
                 print("  Set TOURNAMENT_API_BASE and ADMIN_API_BASE environment variables to change URLs")
                 return
 
-            elif sys.argv[1] == '--list-courses':
+            elif args[0] == '--list-courses':
                 # List available courses
                 available_courses = generator.list_available_courses()
                 if available_courses:
@@ -495,24 +770,24 @@ def main():
                     print(f"python generate_hole_cards.py --courses {course_list} ...")
                 return
 
-            elif sys.argv[1] == '--courses':
+            elif args[0] == '--courses':
                 # Generate cards for specific courses
-                if len(sys.argv) < 3:
+                if len(args) < 2:
                     logger.error("Please specify course names after --courses")
                     logger.error("Use --list-courses to see available courses")
                     sys.exit(1)
 
-                course_names = sys.argv[2:]
+                course_names = args[1:]
                 logger.info(f"Generating cards for specified courses: {', '.join(course_names)}")
-                generator.generate_specific_cards(course_names)
+                generator.generate_specific_cards(course_names, combined)
 
             else:
-                logger.error(f"Unknown argument: {sys.argv[1]}")
+                logger.error(f"Unknown argument: {args[0]}")
                 logger.error("Use --help for usage information")
                 sys.exit(1)
         else:
             # Generate cards for all courses
-            generator.generate_all_cards()
+            generator.generate_all_cards(combined)
 
         generator.close()
 
@@ -7,22 +7,37 @@ tournament API to generate QR codes, then creates 5"x7" PDF cards for each team.
 """
 
 import os
+import re
 import sys
+import time
 import json
 import base64
+import asyncio
+import httpx
+import msgpack
+import qrcode
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from tenacity import retry, retry_if_exception_type, retry_if_result, stop_after_attempt, wait_exponential
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    json_loads = json.loads
 import logging
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
 from pathlib import Path
 
 # PDF generation
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import inch
+from reportlab.lib.utils import ImageReader
 from reportlab.pdfgen import canvas
+from reportlab.pdfbase.pdfmetrics import stringWidth
 from reportlab.lib.colors import HexColor, black, white
 
 import io
-from PIL import Image
 
 # Configure logging
 logging.basicConfig(
@@ -30,63 +45,345 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
+logging.getLogger('httpx').setLevel(logging.WARNING)  # httpx logs every request at INFO
 
 # API Configuration
 TOURNAMENT_API_BASE = os.getenv('TOURNAMENT_API_BASE', 'http://localhost:8000/tournament')
 MAIN_API_BASE = os.getenv('ADMIN_API_BASE', 'http://localhost:8000')
 API_TIMEOUT = 30
+MAX_WORKERS = int(os.getenv('MAX_WORKERS', '20'))  # Concurrent connections to the tournament API
+BATCH_SIZE = 100  # Teams per /generate-team-cards request
+VECTOR_QR = os.getenv('VECTOR_QR', '1') != '0'  # Draw QR codes locally as vector paths instead of embedding the API's PNG
+# Cached QR codes older than this are refetched; the roster and tournaments on a card can change without touching the /teams record
+QR_CACHE_TTL = int(os.getenv('QR_CACHE_TTL', '3600'))
 
 # PDF Configuration
 CARD_WIDTH = 5 * inch  # 5 inches
 CARD_HEIGHT = 7 * inch  # 7 inches
 MARGIN = 0.25 * inch
 
+# Card colors and fixed text, built once rather than per card
+PRIMARY_COLOR = HexColor('#1B4332')  # Dark Green
+SECONDARY_COLOR = HexColor('#2D6A4F')  # Medium Green
+ACCENT_COLOR = HexColor('#40916C')  # Light Green
+TEXT_COLOR = HexColor('#081C15')  # Very Dark Green
+FOOTER_COLOR = HexColor('#666666')
+QR_LABEL_TEXT = "SCAN TO LOAD TEAM"
+QR_LABEL_X = (CARD_WIDTH - stringWidth(QR_LABEL_TEXT, "Helvetica-Bold", 10)) / 2
+INFO_Y = CARD_HEIGHT - 2.1*inch  # Centre line of the player count bar
+BACKGROUND_FORM = 'team_card_background'
+_SAFE_RE = re.compile(r'[^\w \-]+')  # Characters dropped from team names in filenames
+
+def _timestamp(value):
+    """POSIX timestamp for an epoch number (seconds or milliseconds) or ISO 8601 string, or None if unparseable"""
+    if isinstance(value, (int, float)):
+        return value / 1000 if value > 1e11 else float(value)
+    try:
+        parsed = datetime.fromisoformat(str(value).split('[')[0])
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+@retry(
+    stop=stop_after_attempt(4),
+    wait=wait_exponential(multiplier=0.3, max=5),
+    retry=retry_if_exception_type(httpx.TransportError) | retry_if_result(lambda response: response.status_code >= 500),
+    # Out of attempts: hand back the last 5xx response, or re-raise the last connection error
+    retry_error_callback=lambda retry_state: retry_state.outcome.result()
+)
+async def post_with_retry(client, url, payload):
+    """POST JSON to the tournament API, retrying connection errors, timeouts and 5xx responses but not 4xx"""
+    return await client.post(url, json=payload, timeout=API_TIMEOUT)
+
+def draw_vector_qr(c, payload, x, y, size):
+    """Draw the QR code for payload as filled rectangles, encoded the same way as the tournament API"""
+    qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_L, border=4)
+    qr.add_data(payload)
+    qr.make(fit=True)
+    matrix = qr.get_matrix()  # includes the border
+
+    module = size / len(matrix)
+    path = c.beginPath()
+    for row, cells in enumerate(matrix):
+        top = y + size - (row + 1) * module
+        col = 0
+        # One rectangle per horizontal run of dark modules
+        while col < len(cells):
+            if cells[col]:
+                start = col
+                while col < len(cells) and cells[col]:
+                    col += 1
+                path.rect(x + start * module, top, (col - start) * module, module)
+            else:
+                col += 1
+
+    c.setFillColor(black)
+    c.drawPath(path, fill=1, stroke=0)
+
+def draw_card_background(c, footer_prefix):
+    """Draw the parts of a team card that are the same on every card, defined once per canvas as a form XObject"""
+    if not c.hasForm(BACKGROUND_FORM):
+        c.beginForm(BACKGROUND_FORM)
+
+        # Background
+        c.setFillColor(white)
+        c.rect(0, 0, CARD_WIDTH, CARD_HEIGHT, fill=1)
+
+        # Header background
+        c.setFillColor(PRIMARY_COLOR)
+        c.rect(0, CARD_HEIGHT - 1.8*inch, CARD_WIDTH, 1.8*inch, fill=1)
+
+        # Player count bar
+        c.setFillColor(ACCENT_COLOR)
+        c.rect(MARGIN, INFO_Y - 0.25*inch, CARD_WIDTH - 2*MARGIN, 0.5*inch, fill=1)
+
+        # Footer, up to the team number
+        c.setFillColor(FOOTER_COLOR)
+        c.setFont("Helvetica", 8)
+        c.drawString(MARGIN, 0.2*inch, footer_prefix)
+
+        # Decorative border; nothing drawn on top of the form reaches it
+        c.setStrokeColor(SECONDARY_COLOR)
+        c.setLineWidth(2)
+        c.rect(MARGIN/2, MARGIN/2, CARD_WIDTH - MARGIN, CARD_HEIGHT - MARGIN, fill=0)
+
+        c.endForm()
+    c.doForm(BACKGROUND_FORM)
+
+def _draw_card(c, team_data, qr_png, footer_prefix):
+    """Draw one team card on the current page of canvas c"""
+    qr_payload = team_data.get('qr_payload')
+
+    # Background, header, player count bar, footer prefix and border
+    draw_card_background(c, footer_prefix)
+
+    # Team name
+    c.setFillColor(white)
+    c.setFont("Helvetica-Bold", 18)
+    team_name_text = team_data['team_name']
+    text_width = c.stringWidth(team_name_text, "Helvetica-Bold", 18)
+    c.drawString((CARD_WIDTH - text_width) / 2, CARD_HEIGHT - 0.5*inch, team_name_text)
+
+    # Team number - large display
+    c.setFont("Helvetica-Bold", 56)
+    team_number_text = f"#{team_data['team_number']}"
+    text_width = c.stringWidth(team_number_text, "Helvetica-Bold", 56)
+    c.drawString((CARD_WIDTH - text_width) / 2, CARD_HEIGHT - 1.4*inch, team_number_text)
+
+    # Player count information
+    player_count = len(team_data.get('players', []))
+    info_y = INFO_Y
+
+    c.setFillColor(white)
+    c.setFont("Helvetica-Bold", 16)
+    players_text = f"{player_count} Players"
+    text_width = c.stringWidth(players_text, "Helvetica-Bold", 16)
+    c.drawString((CARD_WIDTH - text_width) / 2, info_y - 0.05*inch, players_text)
+
+    # Player Names Section
+    players = team_data.get('players', [])
+    if players:
+        c.setFillColor(TEXT_COLOR)
+        c.setFont("Helvetica", 11)
+
+        # Start position for player names
+        players_start_y = info_y - 0.6*inch
+        current_y = players_start_y
+
+        # Calculate available width for player names (with margins)
+        available_width = CARD_WIDTH - 2 * MARGIN
+
+        # Display player names with numbers
+        players_per_line = 2  # Two players per line for better readability
+        line_height = 0.15*inch
+
+        for i, player in enumerate(players[:8]):  # Limit to 8 players to fit on card
+            player_name = player.get('name', 'Unknown Player')
+            player_number = player.get('number', 'N/A')
+
+            # Format: "Name (#123)"
+            player_text = f"{player_name} (#{player_number})"
+
+            # Truncate if too long
+            max_char_per_name = 20  # Adjust based on font size
+            if len(player_text) > max_char_per_name:
+                truncated_name = player_name[:15] + "..."
+                player_text = f"{truncated_name} (#{player_number})"
+
+            # Position calculation
+            if i % players_per_line == 0:
+                # Left column
+                x_pos = MARGIN + 0.1*inch
+            else:
+                # Right column
+                x_pos = CARD_WIDTH / 2 + 0.1*inch
+
+            # Draw player name
+            c.drawString(x_pos, current_y, player_text)
+
+            # Move to next line after every 2 players
+            if i % players_per_line == 1:
+                current_y -= line_height
+
+        # Show "and X more..." if there are more than 8 players
+        if len(players) > 8:
+            c.setFont("Helvetica-Oblique", 9)
+            more_text = f"...and {len(players) - 8} more players"
+            text_width = c.stringWidth(more_text, "Helvetica-Oblique", 9)
+            c.drawString((CARD_WIDTH - text_width) / 2, current_y - 0.1*inch, more_text)
+            current_y -= 0.15*inch
+
+    # QR Code (repositioned to accommodate player names)
+    if qr_payload or qr_png:
+        qr_size = 1.8 * inch  # Slightly smaller to fit more content
+        qr_x = (CARD_WIDTH - qr_size) / 2
+
+        # Position QR code based on available space
+        if players:
+            qr_y = max(current_y - qr_size - 0.2*inch, 0.8*inch)  # Ensure minimum bottom margin
+        else:
+            qr_y = 1.2 * inch  # Default position if no players
+
+        # QR code background
+        c.setFillColor(white)
+        c.rect(qr_x - 0.1*inch, qr_y - 0.1*inch, qr_size + 0.2*inch, qr_size + 0.2*inch, fill=1)
+        c.setStrokeColor(PRIMARY_COLOR)
+        c.setLineWidth(3)
+        c.rect(qr_x - 0.1*inch, qr_y - 0.1*inch, qr_size + 0.2*inch, qr_size + 0.2*inch, fill=0)
+
+        # Draw QR code; vector paths when we have the payload, otherwise the API's PNG as an image XObject
+        if qr_payload:
+            draw_vector_qr(c, qr_payload, qr_x, qr_y, qr_size)
+        else:
+            c.drawImage(ImageReader(io.BytesIO(qr_png)), qr_x, qr_y, qr_size, qr_size,
+                        preserveAspectRatio=True, mask='auto')
+
+        # QR code label
+        c.setFillColor(TEXT_COLOR)
+        c.setFont("Helvetica-Bold", 10)
+        c.drawString(QR_LABEL_X, qr_y - 0.25*inch, QR_LABEL_TEXT)
+
+    # Tournament information (if available and space permits)
+    tournaments = team_data.get('tournaments', [])
+    tournament_y_position = qr_y - 0.35*inch
+
+    # Only show tournaments if there's enough space (avoid overlapping with footer)
+    if tournaments and tournament_y_position > 0.6*inch:
+        c.setFillColor(TEXT_COLOR)
+        c.setFont("Helvetica", 9)
+
+        # Show first tournament only to save space
+        tournament = tournaments[0]
+        tournament_name = tournament.get('tournament_name', 'Unknown Tournament')
+
+        # Truncate tournament name if too long
+        max_tournament_length = 35
+        if len(tournament_name) > max_tournament_length:
+            tournament_name = tournament_name[:max_tournament_length] + "..."
+
+        text_width = c.stringWidth(tournament_name, "Helvetica", 9)
+        c.drawString((CARD_WIDTH - text_width) / 2, tournament_y_position, tournament_name)
+
+        # Show count if multiple tournaments
+        if len(tournaments) > 1:
+            more_text = f"(+{len(tournaments) - 1} more)"
+            text_width = c.stringWidth(more_text, "Helvetica", 8)
+            c.setFont("Helvetica", 8)
+            c.drawString((CARD_WIDTH - text_width) / 2, tournament_y_position - 0.12*inch, more_text)
+
+    # Footer team number, after the prefix in the background form
+    c.setFillColor(FOOTER_COLOR)
+    c.setFont("Helvetica", 8)
+    c.drawString(MARGIN + stringWidth(footer_prefix, "Helvetica", 8), 0.2*inch, str(team_data.get('team_number', 'N/A')))
+
+def create_team_card_pdf(output_dir, team_data, qr_png, footer_prefix):
+    """Create a 5x7 inch PDF card for a team. Module-level so it can run in a worker process."""
+    try:
+        # Create filename
+        team_name_safe = _SAFE_RE.sub('', team_data['team_name']).rstrip()
+        filename = f"team_card_{team_name_safe}_#{team_data['team_number']:03d}.pdf"
+        filepath = output_dir / filename
+
+        # Create PDF canvas
+        c = canvas.Canvas(str(filepath), pagesize=(CARD_WIDTH, CARD_HEIGHT))
+        _draw_card(c, team_data, qr_png, footer_prefix)
+
+        # Save PDF
+        c.save()
+        logger.info(f"Created team card: {filename}")
+        return filepath
+
+    except Exception as e:
+        logger.error(f"Error creating PDF for team {team_data['team_name']}: {e}")
+        return None
+
 class TeamCardGenerator:
-    def __init__(self):
+    def __init__(self, max_workers=MAX_WORKERS, use_cache=True, refresh_cache=False, jobs=None, vector_qr=VECTOR_QR):
         self.output_dir = Path('teamcards')
+        self.max_workers = max_workers
+        self.jobs = jobs or os.cpu_count() or 1
+        self.use_cache = use_cache
+        self.refresh_cache = refresh_cache
+        self.vector_qr = vector_qr
+        # Stamped once per run and handed to the workers, which may have imported this module at a different minute
+        self._footer_prefix = f"Generated: {datetime.now():%Y-%m-%d %H:%M} | Team ID: "
         self.tournament_api = TOURNAMENT_API_BASE
         self.main_api = MAIN_API_BASE
+        self.session = self.create_session()
         self.setup_api_connections()
         self.setup_output_directory()
 
+    def create_session(self):
+        """Create a pooled HTTP session so requests reuse keep-alive connections"""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=20,
+            pool_maxsize=50,
+            max_retries=Retry(total=3, backoff_factor=0.3)
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update({'Content-Type': 'application/json'})
+        return session
+
     def setup_api_connections(self):
-        """Test connections to both APIs"""
-        # Test tournament API
-        try:
-            response = requests.get(f'{self.tournament_api}/health', timeout=5)
-            if response.status_code == 200:
-                logger.info(f"Successfully connected to tournament API at {self.tournament_api}")
-            else:
-                logger.warning(f"Tournament API responded with status {response.status_code}")
-        except Exception as e:
-            logger.error(f"Failed to connect to tournament API: {e}")
-            logger.error(f"Make sure tournament_app.py is running at {self.tournament_api}")
-            sys.exit(1)
+        """Test connections to both APIs, concurrently"""
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            tournament_ok = executor.submit(self.check_api, "tournament", self.tournament_api, "tournament_app.py")
+            main_ok = executor.submit(self.check_api, "main", self.main_api, "main.py")
+            if not (tournament_ok.result() and main_ok.result()):
+                sys.exit(1)
 
-        # Test main API
+    def check_api(self, name, base_url, app_file):
+        """Check one API's /health endpoint. Returns False if it can't be reached at all."""
         try:
-            response = requests.get(f'{self.main_api}/health', timeout=5)
+            response = self.session.get(f'{base_url}/health', timeout=5)
             if response.status_code == 200:
-                logger.info(f"Successfully connected to main API at {self.main_api}")
+                logger.info(f"Successfully connected to {name} API at {base_url}")
             else:
-                logger.warning(f"Main API responded with status {response.status_code}")
+                logger.warning(f"{name.capitalize()} API responded with status {response.status_code}")
+            return True
         except Exception as e:
-            logger.error(f"Failed to connect to main API: {e}")
-            logger.error(f"Make sure main.py is running at {self.main_api}")
-            sys.exit(1)
+            logger.error(f"Failed to connect to {name} API: {e}")
+            logger.error(f"Make sure {app_file} is running at {base_url}")
+            return False
 
     def setup_output_directory(self):
         """Create output directory if it doesn't exist"""
         self.output_dir.mkdir(exist_ok=True)
+        if self.use_cache:
+            (self.output_dir / '.qrcache').mkdir(exist_ok=True)
         logger.info(f"Output directory: {self.output_dir.absolute()}")
 
     def get_teams_from_main_api(self):
         """Get list of all teams from main API"""
         try:
-            response = requests.get(f'{self.main_api}/teams', timeout=API_TIMEOUT)
+            response = self.session.get(f'{self.main_api}/teams', timeout=API_TIMEOUT)
 
             if response.status_code == 200:
-                teams_data = response.json()
+                teams_data = json_loads(response.content)
                 logger.info(f"Retrieved {len(teams_data)} teams from main API")
                 return teams_data
             else:
@@ -97,327 +394,331 @@ class TeamCardGenerator:
             logger.error(f"Error getting teams from main API: {e}")
             return []
 
-    def get_team_qr_from_tournament_api(self, team_number):
+    async def get_team_qr_from_tournament_api(self, client, team_number):
         """Get QR code and team data from tournament API"""
         try:
-            response = requests.post(
+            response = await post_with_retry(
+                client,
                 f'{self.tournament_api}/generate-team-card',
-                json={'team_number': team_number},
-                headers={'Content-Type': 'application/json'},
-                timeout=API_TIMEOUT
+                # Vector QR codes are drawn from encoded_data, so skip the PNG
+                {'team_number': team_number, 'include_qr_image': not self.vector_qr}
             )
 
             if response.status_code == 200:
-                data = response.json()
+                data = json_loads(response.content)
 
                 if 'qr_code_base64' in data and 'encoded_data' in data:
-                    # Decode base64 QR code image
-                    qr_image_data = base64.b64decode(data['qr_code_base64'])
-                    qr_image_buffer = io.BytesIO(qr_image_data)
+                    # Decode base64 QR code image; empty when include_qr_image is off.
+                    # Kept as plain bytes: it goes to the cache and the render workers as-is.
+                    qr_png = base64.b64decode(data['qr_code_base64']) or None
 
                     # Parse team data from encoded_data
                     team_info = data['encoded_data']
 
-                    return qr_image_buffer, team_info
+                    return qr_png, team_info
                 else:
-                    logger.error(f"Tournament API response missing QR code data for team {team_name}")
+                    logger.error(f"Tournament API response missing QR code data for team #{team_number}")
                     return None, None
             else:
-                logger.error(f"Tournament API error {response.status_code} for team {team_name}")
+                logger.error(f"Tournament API error {response.status_code} for team #{team_number}")
                 if response.text:
                     logger.error(f"Response: {response.text}")
                 return None, None
 
-        except requests.RequestException as e:
-            logger.error(f"Network error getting QR code for team {team_name}: {e}")
+        except httpx.HTTPError as e:
+            logger.error(f"Network error getting QR code for team #{team_number}: {e}")
             return None, None
         except json.JSONDecodeError as e:
-            logger.error(f"Error decoding tournament API response for team {team_name}: {e}")
+            logger.error(f"Error decoding tournament API response for team #{team_number}: {e}")
             return None, None
         except Exception as e:
-            logger.error(f"Unexpected error getting QR code for team {team_name}: {e}")
+            logger.error(f"Unexpected error getting QR code for team #{team_number}: {e}")
             return None, None
 
-    def get_all_teams_with_qr(self):
-        """Get all teams from main API and their QR codes from tournament API"""
+    def collect_teams(self, selected, on_team=None):
+        """
+        Get QR codes and team data for (team_name, team_number, team_info) items, fetching concurrently.
+        on_team, if given, is called with each team's data as soon as its QR code is available.
+        """
+        return asyncio.run(self._collect_all(selected, on_team))
+
+    async def _collect_all(self, selected, on_team=None):
+        """Serve what the on-disk cache has, then fetch the rest on one event loop, handling each result as it lands"""
         all_teams = []
 
+        def add_team(item, qr_png, detailed_team_data):
+            team_data = self.add_team(all_teams, item[0], item[1], qr_png, detailed_team_data)
+            if team_data and on_team:
+                on_team(team_data)
+
+        pending = []
+        for item in selected:
+            cached = self.load_cached_qr(item) if self.use_cache and not self.refresh_cache else None
+            if cached:
+                add_team(item, *cached)
+            else:
+                pending.append(item)
+
+        if len(pending) < len(selected):
+            logger.info(f"Loaded {len(selected) - len(pending)} QR codes from cache")
+
+        limits = httpx.Limits(max_connections=self.max_workers)
+        async with httpx.AsyncClient(limits=limits, timeout=API_TIMEOUT) as client:
+            async def fetch_batch(batch):
+                return batch, await self.get_team_qrs_bulk(client, [item[1] for item in batch])
+
+            async def fetch_single(item):
+                try:
+                    return item, await self.get_team_qr_from_tournament_api(client, item[1])
+                except Exception as e:
+                    logger.error(f"Error getting QR code for team #{item[1]}: {e}")
+                    return item, (None, None)
+
+            # Bulk requests first, all in flight at once and handled as each one lands
+            batches = [pending[i:i + BATCH_SIZE] for i in range(0, len(pending), BATCH_SIZE)]
+
+            single = []
+            for next_batch in asyncio.as_completed([fetch_batch(batch) for batch in batches]):
+                batch, results = await next_batch
+                if results is None:
+                    # Tournament API without the bulk endpoint; fetch these teams one at a time
+                    single.extend(batch)
+                    continue
+
+                for item, (qr_png, detailed_team_data) in zip(batch, results):
+                    self.store_cached_qr(item, qr_png, detailed_team_data)
+                    add_team(item, qr_png, detailed_team_data)
+
+            for next_single in asyncio.as_completed([fetch_single(item) for item in single]):
+                item, (qr_png, detailed_team_data) = await next_single
+                self.store_cached_qr(item, qr_png, detailed_team_data)
+                add_team(item, qr_png, detailed_team_data)
+
+        return all_teams
+
+    async def get_team_qrs_bulk(self, client, team_numbers):
+        """
+        Get QR codes and team data for many teams in one tournament API call.
+        Returns a list of (qr_png, team_info) aligned with team_numbers, or None if the bulk endpoint isn't available.
+        """
+        try:
+            response = await post_with_retry(
+                client,
+                f'{self.tournament_api}/generate-team-cards',
+                {'team_numbers': team_numbers, 'include_qr_image': not self.vector_qr}
+            )
+
+            if response.status_code == 404:
+                return None
+
+            if response.status_code != 200:
+                logger.error(f"Tournament API error {response.status_code} for {len(team_numbers)} teams")
+                if response.text:
+                    logger.error(f"Response: {response.text}")
+                return [(None, None)] * len(team_numbers)
+
+            # Missing teams are left out of the response, so match results back by team number
+            cards = {}
+            for data in json_loads(response.content):
+                team_info = data['encoded_data']
+                cards[team_info['team_number']] = (base64.b64decode(data.get('qr_code_base64') or '') or None, team_info)
+
+            return [cards.get(team_number, (None, None)) for team_number in team_numbers]
+
+        except httpx.HTTPError as e:
+            logger.error(f"Network error getting QR codes for {len(team_numbers)} teams: {e}")
+            return [(None, None)] * len(team_numbers)
+        except Exception as e:
+            logger.error(f"Unexpected error getting QR codes for {len(team_numbers)} teams: {e}")
+            return [(None, None)] * len(team_numbers)
+
+    def _qr_cache_path(self, item):
+        """Cache file for a team's QR code, one per team number"""
+        return self.output_dir / '.qrcache' / f"{item[1]}.msgpack"
+
+    def load_cached_qr(self, item):
+        """Return (qr_png, team_info) from the on-disk QR cache, or None on a miss. qr_png is None if only team data was cached."""
+        team_name, team_number, team = item
+        cache_path = self._qr_cache_path(item)
+        try:
+            written_at = cache_path.stat().st_mtime
+            if time.time() - written_at > QR_CACHE_TTL:
+                return None
+            entry = msgpack.unpackb(cache_path.read_bytes())
+        except (OSError, ValueError, msgpack.UnpackException):
+            return None
+
+        # Stale if the team's main API record has changed since the entry was written
+        if entry.get('team') != team:
+            return None
+        updated_at = team.get('updated_at')
+        if updated_at:
+            updated_ts = _timestamp(updated_at)
+            if updated_ts is None or updated_ts > written_at:
+                return None
+
+        # Vector QR codes only need the team data
+        if not (entry.get('qr_png') or self.vector_qr):
+            return None
+        return entry.get('qr_png'), entry['team_info']
+
+    def store_cached_qr(self, item, qr_png, team_info):
+        """Write a freshly fetched QR code and its team data to the on-disk cache"""
+        if not (self.use_cache and team_info):
+            return
+        cache_path = self._qr_cache_path(item)
+        tmp_path = cache_path.with_name(cache_path.name + '.tmp')
+        try:
+            tmp_path.write_bytes(msgpack.packb({
+                'team': item[2],
+                'team_info': team_info,
+                'qr_png': qr_png
+            }))
+            # Atomic rename, so a partial write never looks like a cache hit
+            tmp_path.replace(cache_path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not cache QR code for team #{item[1]}: {e}")
+
+    def add_team(self, all_teams, team_name, team_number, qr_png, detailed_team_data):
+        """Combine main API data with tournament API data and append it to all_teams. Returns the combined data, or None."""
+        if detailed_team_data and (qr_png or self.vector_qr):
+            combined_team_data = {
+                'team_name': team_name,
+                'team_number': team_number,
+                'players': detailed_team_data.get('players', []),
+                'tournaments': detailed_team_data.get('tournaments', []),
+                'generated_at': detailed_team_data.get('generated_at', ''),
+                # Same JSON the tournament API encodes, so the card can draw the QR code itself
+                'qr_payload': json.dumps(detailed_team_data) if self.vector_qr else None,
+                'qr_png': qr_png
+            }
+            all_teams.append(combined_team_data)
+            logger.info(f"Successfully processed team {team_name}")
+            return combined_team_data
+        else:
+            logger.warning(f"Could not get QR code for team {team_name}")
+            return None
+
+    def get_all_teams_with_qr(self, on_team=None):
+        """Get all teams from main API and their QR codes from tournament API"""
         # Get teams from main API
         teams = self.get_teams_from_main_api()
         if not teams:
             logger.error("No teams found from main API")
             return []
 
-        # Process each team
+        selected = []
         for team in teams:
             team_name = team.get('name', 'Unknown Team')
             team_number = team.get('number', team.get('team_number', 0))
 
             logger.info(f"Processing team: {team_name} (#{team_number})")
+            selected.append((team_name, team_number, team))
 
-            try:
-                # Get QR code and detailed team data from tournament API
-                qr_buffer, detailed_team_data = self.get_team_qr_from_tournament_api(team_number)
-
-                if qr_buffer and detailed_team_data:
-                    # Combine main API data with tournament API data
-                    combined_team_data = {
-                        'team_name': team_name,
-                        'team_number': team_number,
-                        'players': detailed_team_data.get('players', []),
-                        'tournaments': detailed_team_data.get('tournaments', []),
-                        'generated_at': detailed_team_data.get('generated_at', ''),
-                        'qr_code_buffer': qr_buffer
-                    }
-                    all_teams.append(combined_team_data)
-                    logger.info(f"Successfully processed team {team_name}")
-                else:
-                    logger.warning(f"Could not get QR code for team {team_name}")
-
-            except Exception as e:
-                logger.error(f"Error processing team {team_name}: {e}")
-                continue
+        all_teams = self.collect_teams(selected, on_team)
 
         logger.info(f"Successfully processed {len(all_teams)} teams total")
         return all_teams
 
-    def get_specific_teams_with_qr(self, team_names):
+    def get_specific_teams_with_qr(self, team_names, on_team=None):
         """Get specific teams only"""
-        all_teams = []
-
         # Get all teams from main API first
         all_available_teams = self.get_teams_from_main_api()
         if not all_available_teams:
             logger.error("No teams found from main API")
             return []
 
+        # Index by lowercased name, keeping the first team for a repeated name as the linear search did
+        teams_by_name = {}
+        for team in all_available_teams:
+            teams_by_name.setdefault(team.get('name', '').lower(), team)
+
         # Filter for requested teams
+        selected = []
         for team_name in team_names:
-            # Find team in available teams
-            team_found = False
-            for team in all_available_teams:
-                if team.get('name', '').lower() == team_name.lower():
-                    team_found = True
-                    team_number = team.get('number', team.get('team_number', 0))
-
-                    logger.info(f"Processing specified team: {team_name} (#{team_number})")
-
-                    try:
-                        # Get QR code and detailed team data from tournament API
-                        qr_buffer, detailed_team_data = self.get_team_qr_from_tournament_api(team_number)
-
-                        if qr_buffer and detailed_team_data:
-                            # Combine main API data with tournament API data
-                            combined_team_data = {
-                                'team_name': team_name,
-                                'team_number': team_number,
-                                'players': detailed_team_data.get('players', []),
-                                'tournaments': detailed_team_data.get('tournaments', []),
-                                'generated_at': detailed_team_data.get('generated_at', ''),
-                                'qr_code_buffer': qr_buffer
-                            }
-                            all_teams.append(combined_team_data)
-                            logger.info(f"Successfully processed team {team_name}")
-                        else:
-                            logger.warning(f"Could not get QR code for team {team_name}")
-
-                    except Exception as e:
-                        logger.error(f"Error processing team {team_name}: {e}")
-                    break
-
-            if not team_found:
+            team = teams_by_name.get(team_name.lower())
+            if team is None:
                 logger.warning(f"Team '{team_name}' not found in available teams")
+                continue
+
+            team_number = team.get('number', team.get('team_number', 0))
+            logger.info(f"Processing specified team: {team_name} (#{team_number})")
+            selected.append((team_name, team_number, team))
+
+        all_teams = self.collect_teams(selected, on_team)
 
         logger.info(f"Successfully processed {len(all_teams)} teams for specified teams")
         return all_teams
 
-    def create_team_card_pdf(self, team_data, qr_image_buffer):
-        """Create a 5x7 inch PDF card for a team"""
-        try:
-            # Create filename
-            team_name_safe = "".join(c for c in team_data['team_name'] if c.isalnum() or c in (' ', '-', '_')).rstrip()
-            filename = f"team_card_{team_name_safe}_#{team_data['team_number']:03d}.pdf"
-            filepath = self.output_dir / filename
-
-            # Create PDF canvas
-            c = canvas.Canvas(str(filepath), pagesize=(CARD_WIDTH, CARD_HEIGHT))
-
-            # Colors
-            primary_color = HexColor('#1B4332')  # Dark Green
-            secondary_color = HexColor('#2D6A4F')  # Medium Green  
-            accent_color = HexColor('#40916C')  # Light Green
-            text_color = HexColor('#081C15')  # Very Dark Green
-            highlight_color = HexColor('#F1C40F')  # Gold
-
-            # Background
-            c.setFillColor(white)
-            c.rect(0, 0, CARD_WIDTH, CARD_HEIGHT, fill=1)
-
-            # Header background
-            c.setFillColor(primary_color)
-            c.rect(0, CARD_HEIGHT - 1.8*inch, CARD_WIDTH, 1.8*inch, fill=1)
-
-            # Team name
-            c.setFillColor(white)
-            c.setFont("Helvetica-Bold", 18)
-            team_name_text = team_data['team_name']
-            text_width = c.stringWidth(team_name_text, "Helvetica-Bold", 18)
-            c.drawString((CARD_WIDTH - text_width) / 2, CARD_HEIGHT - 0.5*inch, team_name_text)
-
-            # Team number - large display
-            c.setFont("Helvetica-Bold", 56)
-            team_number_text = f"#{team_data['team_number']}"
-            text_width = c.stringWidth(team_number_text, "Helvetica-Bold", 56)
-            c.drawString((CARD_WIDTH - text_width) / 2, CARD_HEIGHT - 1.4*inch, team_number_text)
-
-            # Player count information
-            player_count = len(team_data.get('players', []))
-            c.setFillColor(accent_color)
-            info_y = CARD_HEIGHT - 2.1*inch
-            c.rect(MARGIN, info_y - 0.25*inch, CARD_WIDTH - 2*MARGIN, 0.5*inch, fill=1)
-
-            c.setFillColor(white)
-            c.setFont("Helvetica-Bold", 16)
-            players_text = f"{player_count} Players"
-            text_width = c.stringWidth(players_text, "Helvetica-Bold", 16)
-            c.drawString((CARD_WIDTH - text_width) / 2, info_y - 0.05*inch, players_text)
-
-            # Player Names Section
-            players = team_data.get('players', [])
-            if players:
-                c.setFillColor(text_color)
-                c.setFont("Helvetica", 11)
-
-                # Start position for player names
-                players_start_y = info_y - 0.6*inch
-                current_y = players_start_y
-
-                # Calculate available width for player names (with margins)
-                available_width = CARD_WIDTH - 2 * MARGIN
-
-                # Display player names with numbers
-                players_per_line = 2  # Two players per line for better readability
-                line_height = 0.15*inch
-
-                for i, player in enumerate(players[:8]):  # Limit to 8 players to fit on card
-                    player_name = player.get('name', 'Unknown Player')
-                    player_number = player.get('number', 'N/A')
-
-                    # Format: "Name (#123)"
-                    player_text = f"{player_name} (#{player_number})"
-
-                    # Truncate if too long
-                    max_char_per_name = 20  # Adjust based on font size
-                    if len(player_text) > max_char_per_name:
-                        truncated_name = player_name[:15] + "..."
-                        player_text = f"{truncated_name} (#{player_number})"
-
-                    # Position calculation
-                    if i % players_per_line == 0:
-                        # Left column
-                        x_pos = MARGIN + 0.1*inch
-                    else:
-                        # Right column
-                        x_pos = CARD_WIDTH / 2 + 0.1*inch
-
-                    # Draw player name
-                    c.drawString(x_pos, current_y, player_text)
-
-                    # Move to next line after every 2 players
-                    if i % players_per_line == 1:
-                        current_y -= line_height
-
-                # Show "and X more..." if there are more than 8 players
-                if len(players) > 8:
-                    c.setFont("Helvetica-Oblique", 9)
-                    more_text = f"...and {len(players) - 8} more players"
-                    text_width = c.stringWidth(more_text, "Helvetica-Oblique", 9)
-                    c.drawString((CARD_WIDTH - text_width) / 2, current_y - 0.1*inch, more_text)
-                    current_y -= 0.15*inch
-
-            # QR Code (repositioned to accommodate player names)
-            if qr_image_buffer:
-                qr_size = 1.8 * inch  # Slightly smaller to fit more content
-                qr_x = (CARD_WIDTH - qr_size) / 2
-
-                # Position QR code based on available space
-                if players:
-                    qr_y = max(current_y - qr_size - 0.2*inch, 0.8*inch)  # Ensure minimum bottom margin
+    def render_cards(self, fetch_teams):
+        """
+        Run fetch_teams(on_team=...) and render each team's PDF as soon as its QR code arrives,
+        across self.jobs worker processes. Returns (teams, successful, failed).
+        """
+        executor_class = ProcessPoolExecutor if self.jobs > 1 else ThreadPoolExecutor
+        with executor_class(max_workers=self.jobs) as executor:
+            futures = {}
+
+            def on_team(team_data):
+                # Plain dict and PNG bytes so the task pickles cleanly to the worker processes
+                qr_png = team_data.pop('qr_png')
+                card_data = dict(team_data)
+                # The returned team list only needs the team details; drop the QR code once it's handed off
+                team_data.pop('qr_payload', None)
+                future = executor.submit(create_team_card_pdf, self.output_dir, card_data, qr_png, self._footer_prefix)
+                futures[future] = team_data
+
+            logger.info(f"Creating PDFs with {self.jobs} worker(s) as QR codes arrive")
+            teams = fetch_teams(on_team=on_team)
+
+            successful = failed = 0
+            for future in as_completed(futures):
+                try:
+                    pdf_path = future.result()
+                except Exception as e:
+                    logger.error(f"Error creating PDF for team {futures[future]['team_name']}: {e}")
+                    pdf_path = None
+
+                if pdf_path:
+                    successful += 1
                 else:
-                    qr_y = 1.2 * inch  # Default position if no players
-
-                # QR code background
-                c.setFillColor(white)
-                c.rect(qr_x - 0.1*inch, qr_y - 0.1*inch, qr_size + 0.2*inch, qr_size + 0.2*inch, fill=1)
-                c.setStrokeColor(primary_color)
-                c.setLineWidth(3)
-                c.rect(qr_x - 0.1*inch, qr_y - 0.1*inch, qr_size + 0.2*inch, qr_size + 0.2*inch, fill=0)
-
-                image = Image.open(qr_image_buffer)
-                # Draw QR code
-                c.drawInlineImage(image, qr_x, qr_y, qr_size, qr_size)
-
-                # QR code label
-                c.setFillColor(text_color)
-                c.setFont("Helvetica-Bold", 10)
-                label_text = "SCAN TO LOAD TEAM"
-                text_width = c.stringWidth(label_text, "Helvetica-Bold", 10)
-                c.drawString((CARD_WIDTH - text_width) / 2, qr_y - 0.25*inch, label_text)
-
-            # Tournament information (if available and space permits)
-            tournaments = team_data.get('tournaments', [])
-            tournament_y_position = qr_y - 0.35*inch
-
-            # Only show tournaments if there's enough space (avoid overlapping with footer)
-            if tournaments and tournament_y_position > 0.6*inch:
-                c.setFillColor(text_color)
-                c.setFont("Helvetica", 9)
-
-                # Show first tournament only to save space
-                tournament = tournaments[0]
-                tournament_name = tournament.get('tournament_name', 'Unknown Tournament')
-
-                # Truncate tournament name if too long
-                max_tournament_length = 35
-                if len(tournament_name) > max_tournament_length:
-                    tournament_name = tournament_name[:max_tournament_length] + "..."
-
-                text_width = c.stringWidth(tournament_name, "Helvetica", 9)
-                c.drawString((CARD_WIDTH - text_width) / 2, tournament_y_position, tournament_name)
-
-                # Show count if multiple tournaments
-                if len(tournaments) > 1:
-                    more_text = f"(+{len(tournaments) - 1} more)"
-                    text_width = c.stringWidth(more_text, "Helvetica", 8)
-                    c.setFont("Helvetica", 8)
-                    c.drawString((CARD_WIDTH - text_width) / 2, tournament_y_position - 0.12*inch, more_text)
-
-            # Footer
-            c.setFillColor(HexColor('#666666'))
-            c.setFont("Helvetica", 8)
-            footer_text = f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')} | Team ID: {team_data.get('team_number', 'N/A')}"
-            c.drawString(MARGIN, 0.2*inch, footer_text)
+                    failed += 1
 
-            # Add a decorative border
-            c.setStrokeColor(secondary_color)
-            c.setLineWidth(2)
-            c.rect(MARGIN/2, MARGIN/2, CARD_WIDTH - MARGIN, CARD_HEIGHT - MARGIN, fill=0)
+        return teams, successful, failed
 
-            # Save PDF
+    def create_combined_pdf(self, teams, path):
+        """Draw every team card as a page of one PDF at path. Returns the path, or None on failure."""
+        try:
+            c = canvas.Canvas(str(path), pagesize=(CARD_WIDTH, CARD_HEIGHT))
+            for team_data in sorted(teams, key=lambda t: t['team_number']):
+                _draw_card(c, team_data, team_data['qr_png'], self._footer_prefix)
+                c.showPage()
             c.save()
-            logger.info(f"Created team card: {filename}")
-            return filepath
+            logger.info(f"Created combined team cards: {path}")
+            return path
 
         except Exception as e:
-            logger.error(f"Error creating PDF for team {team_data['team_name']}: {e}")
+            logger.error(f"Error creating combined PDF {path}: {e}")
             return None
 
-    def generate_all_cards(self):
-        """Generate team cards for all teams using both main and tournament APIs"""
+    def render_combined(self, teams, path):
+        """create_combined_pdf with the (successful, failed) tally used by the generate_* methods"""
+        if not teams:
+            return 0, 0
+        if self.create_combined_pdf(teams, path):
+            return len(teams), 0
+        return 0, len(teams)
+
+    def generate_all_cards(self, combined=None):
+        """Generate team cards for all teams using both main and tournament APIs; combined writes one multi-page PDF there instead"""
         logger.info("Starting team card generation using main and tournament APIs...")
 
-        # Get all teams with QR codes
-        teams = self.get_all_teams_with_qr()
+        if combined:
+            teams = self.get_all_teams_with_qr()
+            successful, failed = self.render_combined(teams, combined)
+        else:
+            # Get all teams with QR codes, rendering cards while the rest are fetched
+            teams, successful, failed = self.render_cards(self.get_all_teams_with_qr)
 
         if not teams:
             logger.error("No teams found via APIs. Please check:")
@@ -427,72 +728,27 @@ class TeamCardGenerator:
             logger.error("4. API endpoints are working correctly")
             return
 
-        successful = 0
-        failed = 0
-
-        for team_data in teams:
-            try:
-                logger.info(f"Creating PDF for {team_data['team_name']} (#{team_data['team_number']})")
-
-                # Use QR code buffer from team data
-                qr_image_buffer = team_data.get('qr_code_buffer')
-
-                if not qr_image_buffer:
-                    logger.warning(f"No QR code available for team {team_data['team_name']}")
-                    failed += 1
-                    continue
-
-                # Create PDF
-                pdf_path = self.create_team_card_pdf(team_data, qr_image_buffer)
-                if pdf_path:
-                    successful += 1
-                else:
-                    failed += 1
-
-            except Exception as e:
-                logger.error(f"Error processing team {team_data['team_name']}: {e}")
-                failed += 1
-
         logger.info(f"Team card generation complete!")
         logger.info(f"Successfully created: {successful} cards")
         logger.info(f"Failed: {failed} cards")
         logger.info(f"Output directory: {self.output_dir.absolute()}")
 
-    def generate_specific_cards(self, team_names):
-        """Generate cards for specific teams only"""
+    def generate_specific_cards(self, team_names, combined=None):
+        """Generate cards for specific teams only; combined writes one multi-page PDF there instead"""
         logger.info(f"Generating cards for specific teams: {', '.join(team_names)}")
 
-        teams = self.get_specific_teams_with_qr(team_names)
+        if combined:
+            teams = self.get_specific_teams_with_qr(team_names)
+            successful, failed = self.render_combined(teams, combined)
+        else:
+            teams, successful, failed = self.render_cards(
+                lambda on_team: self.get_specific_teams_with_qr(team_names, on_team)
+            )
 
         if not teams:
             logger.error("No teams found for specified team names")
             return
 
-        successful = 0
-        failed = 0
-
-        for team_data in teams:
-            try:
-                logger.info(f"Creating PDF for {team_data['team_name']} (#{team_data['team_number']})")
-
-                # Use QR code buffer from team data
-                qr_image_buffer = team_data.get('qr_code_buffer')
-
-                if not qr_image_buffer:
-                    failed += 1
-                    continue
-
-                # Create PDF
-                pdf_path = self.create_team_card_pdf(team_data, qr_image_buffer)
-                if pdf_path:
-                    successful += 1
-                else:
-                    failed += 1
-
-            except Exception as e:
-                logger.error(f"Error processing team {team_data['team_name']}: {e}")
-                failed += 1
-
         logger.info(f"Specific team card generation complete!")
         logger.info(f"Successfully created: {successful} cards")
         logger.info(f"Failed: {failed} cards")
@@ -515,22 +771,44 @@ class TeamCardGenerator:
             return []
 
     def close(self):
-        """Cleanup (no database connection to close)"""
-        pass
+        """Close the HTTP session"""
+        self.session.close()
+
+def pop_option(args, flag, description):
+    """Remove flag and its value from args and return the value, or None if flag isn't present"""
+    if flag not in args:
+        return None
+    i = args.index(flag)
+    if i + 1 >= len(args):
+        logger.error(f"Please specify {description} after {flag}")
+        sys.exit(1)
+    value = args[i + 1]
+    del args[i:i + 2]
+    return value
 
 def main():
     """Main function"""
     try:
-        generator = TeamCardGenerator()
+        args = sys.argv[1:]
+        use_cache = '--no-cache' not in args
+        refresh_cache = '--force' in args
+        args = [arg for arg in args if arg not in ('--no-cache', '--force')]
+
+        combined = pop_option(args, '--combined', "an output PDF path")
+
+        generator = TeamCardGenerator(use_cache=use_cache, refresh_cache=refresh_cache)
 
         # Check for command line arguments
-        if len(sys.argv) > 1:
-            if sys.argv[1] == '--help' or sys.argv[1] == '-h':
+        if args:
+            if args[0] == '--help' or args[0] == '-h':
                 print("Team Card Generator")
                 print("Usage:")
                 print("  python generate_team_cards.py                    # Generate cards for all teams")
                 print("  python generate_team_cards.py --list-teams       # List available teams")
                 print("  python generate_team_cards.py --teams [names]    # Generate cards for specific teams")
+                print("  python generate_team_cards.py --no-cache         # Refetch QR codes instead of using teamcards/.qrcache")
+                print("  python generate_team_cards.py --force            # Refetch all QR codes and rewrite teamcards/.qrcache")
+                print("  python generate_team_cards.py --combined PATH    # Write all cards as pages of one PDF at PATH")
                 print("  python generate_team_cards.py --help             # Show this help")
                 print()
                 print("Examples:")
@@ -540,9 +818,10 @@ def main():
                 print(f"  Tournament API: {TOURNAMENT_API_BASE}")
                 print(f"  Main API: {MAIN_API_BASE}")
                 print("  Set TOURNAMENT_API_BASE and MAIN_API_BASE environment variables to change URLs")
+                print(f"  QR cache entries expire after {QR_CACHE_TTL}s (QR_CACHE_TTL)")
                 return
 
-            elif sys.argv[1] == '--list-teams':
+            elif args[0] == '--list-teams':
                 # List available teams
                 available_teams = generator.list_available_teams()
                 if available_teams:
@@ -551,24 +830,24 @@ def main():
                     print(f"python generate_team_cards.py --teams {teamlist}")
                 return
 
-            elif sys.argv[1] == '--teams':
+            elif args[0] == '--teams':
                 # Generate cards for specific teams
-                if len(sys.argv) < 3:
+                if len(args) < 2:
                     logger.error("Please specify team names after --teams")
                     logger.error("Use --list-teams to see available teams")
                     sys.exit(1)
 
-                team_names = sys.argv[2:]
+                team_names = args[1:]
                 logger.info(f"Generating cards for specified teams: {', '.join(team_names)}")
-                generator.generate_specific_cards(team_names)
+                generator.generate_specific_cards(team_names, combined)
 
             else:
-                logger.error(f"Unknown argument: {sys.argv[1]}")
+                logger.error(f"Unknown argument: {args[0]}")
                 logger.error("Use --help for usage information")
                 sys.exit(1)
         else:
             # Generate cards for all teams
-            generator.generate_all_cards()
+            generator.generate_all_cards(combined)
 
         generator.close()
 
@@ -1,13 +1,23 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipResponder
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from neo4j import GraphDatabase
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
+from neo4j import AsyncGraphDatabase, READ_ACCESS
+from neo4j.exceptions import DriverError, ServiceUnavailable, SessionExpired
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
+import asyncio
 import logging
-from contextlib import contextmanager
+import orjson
+import os
+import time
+import atexit
+import queue
+from cachetools import TTLCache
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -26,23 +36,80 @@ stream_handler.setFormatter(log_formatter)
 
 # Get the root logger and add handlers
 logger.setLevel(logging.INFO) # Set desired logging level
-logger.addHandler(file_handler)
-logger.addHandler(stream_handler) 
+
+# Log calls only enqueue the record; a background thread does the file and console
+# writes (and rotation checks) so logging never blocks the event loop
+log_queue = queue.Queue(-1)
+logger.addHandler(QueueHandler(log_queue))
+logger.propagate = False  # The listener already writes to the console; skip the root handler's synchronous copy
+log_listener = QueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+class _ImageSkippingGZipResponder(GZipResponder):
+    """GZipResponder that passes image bodies through, since they are already compressed"""
+
+    async def send_with_gzip(self, message):
+        await super().send_with_gzip(message)
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            if content_type.startswith("image/"):
+                # Same path the responder takes for bodies that are already encoded
+                self.content_encoding_set = True
+
+class ImageSkippingGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that leaves image responses (e.g. hole card PNGs) uncompressed"""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and "gzip" in Headers(scope=scope).get("Accept-Encoding", ""):
+            responder = _ImageSkippingGZipResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+def _orjson_default(value):
+    """Encode the Neo4j temporal types (DateTime, Date, Time, Duration) orjson doesn't know as ISO 8601"""
+    if hasattr(value, "iso_format"):
+        return value.iso_format()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+class GraphJSONResponse(ORJSONResponse):
+    """ORJSONResponse that also accepts Neo4j temporal property values"""
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
 
 # FastAPI app
-app = FastAPI(title="Minigolf Tournament API", version="1.0.0")
+# orjson serializes the dict and list responses several times faster than the stdlib encoder
+app = FastAPI(title="Minigolf Tournament API", version="1.0.0", default_response_class=GraphJSONResponse)
+app.add_middleware(ImageSkippingGZipMiddleware, minimum_size=1000)
+
+@app.exception_handler(Exception)
+async def unhandled_exception_handler(request: Request, exc: Exception):
+    """Turn any error an endpoint doesn't handle into a 500 with the error text, logged once here"""
+    logger.exception("Error handling %s %s: %s", request.method, request.url.path, exc)
+    return GraphJSONResponse({"detail": str(exc)}, status_code=500)
+
+@app.exception_handler(ServiceUnavailable)
+@app.exception_handler(SessionExpired)
+async def database_unavailable_handler(request: Request, exc: Exception):
+    """Lost or unreachable database: 503 so clients and load balancers know to retry"""
+    logger.error("Neo4j unavailable handling %s %s: %s", request.method, request.url.path, exc)
+    return GraphJSONResponse({"detail": "Database unavailable"}, status_code=503)
 
 # Import and mount tournament application
+STATIC_DIRS = {"/mobile": Path("mobile2"), "/leaderboard": Path("leaderboard")}
+
 try:
     from tournament_app import app as tournament_app
     app.mount("/tournament", tournament_app, name="tournament")
-    app.mount("/mobile", StaticFiles(directory=Path("mobile2"), html=True))
-    app.mount("/leaderboard", StaticFiles(directory=Path("leaderboard"), html=True))
+    # The directories are checked at startup, alongside the Neo4j warmup, instead of here
+    app.mount("/mobile", StaticFiles(directory=STATIC_DIRS["/mobile"], html=True, check_dir=False))
+    app.mount("/leaderboard", StaticFiles(directory=STATIC_DIRS["/leaderboard"], html=True, check_dir=False))
     logger.info("Tournament application mounted successfully at /tournament")
 except ImportError as e:
-    logger.warning(f"Could not import tournament_app: {e}")
+    logger.warning("Could not import tournament_app: %s", e)
 except Exception as e:
-    logger.error(f"Error mounting tournament application: {e}")
+    logger.error("Error mounting tournament application: %s", e)
 
 # Neo4j connection settings
 NEO4J_URI = "bolt://raidersofthelostpar.org:7687"
@@ -50,17 +117,21 @@ NEO4J_USER = "neo4j"
 NEO4J_PASSWORD = "minigolf"
 NEO4J_DATABASE = "minigolf"
 
-# Neo4j driver
-driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
+# Driver connection pool; size it to the concurrent requests one uvicorn worker should serve
+NEO4J_MAX_CONNECTION_POOL_SIZE = int(os.getenv("NEO4J_MAX_CONNECTION_POOL_SIZE", "50"))
+NEO4J_CONNECTION_ACQUISITION_TIMEOUT = float(os.getenv("NEO4J_CONNECTION_ACQUISITION_TIMEOUT", "30"))  # seconds
+NEO4J_MAX_CONNECTION_LIFETIME = float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", "3600"))  # seconds
 
-@contextmanager
-def get_db_session():
-    """Context manager for Neo4j database sessions"""
-    session = driver.session(database=NEO4J_DATABASE)
-    try:
+# Rows per chunk when streaming list responses
+STREAM_CHUNK_ROWS = 500
+
+# Neo4j driver (created on startup so it binds to the server's event loop)
+driver = None
+
+async def get_db_session():
+    """FastAPI dependency yielding one Neo4j session for the whole request"""
+    async with driver.session(database=NEO4J_DATABASE) as session:
         yield session
-    finally:
-        session.close()
 
 # Pydantic Models for Nodes
 class LocationCreate(BaseModel):
@@ -192,6 +263,10 @@ class PlayerRoundResponse(BaseModel):
     rank: int
     active: bool
 
+# Pydantic Model for batch lookups
+class NodeBatchRequest(BaseModel):
+    ids: List[int]
+
 # Pydantic Models for Relationships
 class RelationshipCreate(BaseModel):
     from_id: str
@@ -201,14 +276,10 @@ class RelationshipResponse(BaseModel):
     id: str
     from_id: str
     to_id: str
+    from_node: Optional[Dict[str, Any]] = None
+    to_node: Optional[Dict[str, Any]] = None
 
 # Utility functions
-def node_to_dict(node):
-    """Convert Neo4j node to dictionary"""
-    result = dict(node)
-    result['id'] = node.element_id
-    return result
-
 def relationship_to_dict(relationship):
     """Convert Neo4j relationship to dictionary"""
     return {
@@ -217,1164 +288,474 @@ def relationship_to_dict(relationship):
         'to_id': relationship.end_node.element_id
     }
 
+def relationship_with_nodes_to_dict(relationship, from_node: dict, to_node: dict):
+    """Convert Neo4j relationship to dictionary, with the projected properties of both end nodes"""
+    result = relationship_to_dict(relationship)
+    result['from_node'] = from_node
+    result['to_node'] = to_node
+    return result
+
+# Transaction functions for session.execute_read / execute_write, which retry them on transient errors
+async def fetch_records(tx, query: str, params: dict):
+    """Run a query and return all of its records"""
+    result = await tx.run(query, params)
+    return [record async for record in result]
+
+async def consume_summary(tx, query: str, params: dict):
+    """Run a query and return its result summary"""
+    result = await tx.run(query, params)
+    return await result.consume()
+
+# Node labels served by the generic CRUD helpers
+NODE_LABELS = ("Location", "Course", "Hole", "Tournament", "Team", "Department", "Player", "TeamRound", "PlayerRound")
+
+# Cypher for each label, built once so the hot path does no string work and
+# every request sends the server the exact text it already has a plan for
+_QUERIES = {
+    label: {
+        "create": f"CREATE (n:{label} $props) RETURN n{{.*, id: elementId(n)}} AS n",
+        "create_batch": f"UNWIND $rows AS props CREATE (n:{label}) SET n = props RETURN n{{.*, id: elementId(n)}} AS n",
+        "get": f"MATCH (n:{label}) WHERE n.number = $id RETURN n{{.*, id: elementId(n)}} AS n",
+        "get_all": f"MATCH (n:{label}) RETURN n{{.*, id: elementId(n)}} AS n",
+        "update": f"MATCH (n:{label}) WHERE n.number = $id SET n += $props RETURN n{{.*, id: elementId(n)}} AS n",
+        "get_batch": f"UNWIND $ids AS id MATCH (n:{label}) WHERE n.number = id RETURN n{{.*, id: elementId(n)}} AS n",
+        "delete": f"MATCH (n:{label}) WHERE elementId(n) = $id DETACH DELETE n",
+    }
+    for label in NODE_LABELS
+}
+
+# Route slug -> (from label, to label, relationship type)
+RELATIONSHIPS = {
+    "location-has-course": ("Location", "Course", "HAS_COURSE"),
+    "course-has-hole": ("Course", "Hole", "HAS_HOLE"),
+    "tournament-has-team": ("Tournament", "Team", "HAS_TEAM"),
+    "teamround-in-tournament": ("TeamRound", "Tournament", "IN_TOURNAMENT"),
+    "player-member-of-team": ("Player", "Team", "MEMBER_OF"),
+    "player-member-of-department": ("Player", "Department", "MEMBER_OF"),
+    "tournament-played-at-location": ("Tournament", "Location", "PLAYED_AT"),
+    "playerround-played-hole": ("PlayerRound", "Hole", "PLAYED_HOLE"),
+    "team-played-round": ("Team", "TeamRound", "PLAYED_ROUND"),
+    "player-played-round": ("Player", "PlayerRound", "PLAYED_ROUND"),
+    "playerround-played-round-teamround": ("PlayerRound", "TeamRound", "PLAYED_ROUND"),
+    "tournament-uses-course": ("Tournament", "Course", "USES"),
+}
+
+# Directed, label-qualified queries per relationship kind. MEMBER_OF and
+# PLAYED_ROUND each connect more than one pair of labels, and an undirected
+# pattern would return every relationship twice.
+_RELATIONSHIP_QUERIES = {
+    slug: {
+        "create": f"""
+        MATCH (from:{from_label}) WHERE from.name = $from_id
+        MATCH (to:{to_label}) WHERE to.name = $to_id
+        MERGE (from)-[r:{relationship_type}]->(to)
+        RETURN r, from{{.*, id: elementId(from)}} AS from_node, to{{.*, id: elementId(to)}} AS to_node
+        """,
+        "create_batch": f"""
+        UNWIND $pairs AS pair
+        MATCH (from:{from_label}) WHERE from.name = pair.from_id
+        MATCH (to:{to_label}) WHERE to.name = pair.to_id
+        MERGE (from)-[r:{relationship_type}]->(to)
+        RETURN r
+        """,
+        "get": f"MATCH (:{from_label})-[r:{relationship_type}]->(:{to_label}) WHERE elementId(r) = $id RETURN r",
+        "get_all": f"MATCH (:{from_label})-[r:{relationship_type}]->(:{to_label}) RETURN r",
+        "delete": f"MATCH (:{from_label})-[r:{relationship_type}]->(:{to_label}) WHERE elementId(r) = $id DELETE r",
+    }
+    for slug, (from_label, to_label, relationship_type) in RELATIONSHIPS.items()
+}
+
+# In-process cache of GET results, keyed by (node label or relationship type, ...)
+# and dropped by the writes through this API that touch that label or type.
+# The tournament app updates rounds and hole scores directly, so those groups are never cached.
+GET_CACHE_TTL = float(os.getenv("GET_CACHE_TTL", "60"))
+UNCACHED_GROUPS = frozenset({"TeamRound", "PlayerRound", "PLAYED_HOLE"})
+_get_cache = TTLCache(maxsize=10000, ttl=GET_CACHE_TTL)
+_inflight = {}  # key -> Task running its fetch, shared by every request that misses meanwhile
+
+async def cached_get(key: tuple, fetch):
+    """
+    Return the cached result for key, or await fetch() and cache it; None results are not cached.
+    Concurrent misses for the same key, uncached groups included, share one fetch.
+    """
+    if key[0] not in UNCACHED_GROUPS and key in _get_cache:
+        return _get_cache[key]
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(fetch())
+        _inflight[key] = task
+        task.add_done_callback(lambda done: _finish_fetch(key, done))
+    # Shielded so one client disconnecting doesn't cancel the fetch the others are waiting on
+    return await asyncio.shield(task)
+
+def _finish_fetch(key: tuple, task):
+    """Cache a finished fetch's result, unless its key was invalidated while it ran"""
+    error = None if task.cancelled() else task.exception()
+    if _inflight.get(key) is not task:
+        return
+    del _inflight[key]
+    if error is None and not task.cancelled() and key[0] not in UNCACHED_GROUPS and task.result() is not None:
+        _get_cache[key] = task.result()
+
+def invalidate_cache(group: str):
+    """Drop every cached and in-flight result for a node label or relationship type"""
+    for key in [key for key in _get_cache if key[0] == group]:
+        _get_cache.pop(key, None)
+    for key in [key for key in _inflight if key[0] == group]:
+        del _inflight[key]
+
+def clear_cache():
+    """Drop every cached and in-flight result"""
+    _get_cache.clear()
+    _inflight.clear()
+
 # Generic CRUD operations
-def create_node(session, label: str, properties: dict):
+async def create_node(session, label: str, properties: dict):
     """Generic function to create a node"""
-    query = f"CREATE (n:{label} $props) RETURN n"
-    result = session.run(query, props=properties)
-    record = result.single()
-    if record:
-        return node_to_dict(record['n'])
-    return None
-
-def get_node(session, label: str, node_id: str):
-    """Generic function to get a node by ID"""
-    query = f"MATCH (n:{label}) WHERE n.number = $id RETURN n"
-    print(query)
-    print(node_id)
-    result = session.run(query, id=node_id)
-    record = result.single()
-    print(record)
-    if record:
-        return node_to_dict(record['n'])
+    query = _QUERIES[label]["create"]
+    records = await session.execute_write(fetch_records, query, {"props": properties})
+    if records:
+        return records[0]['n']
     return None
 
-def get_all_nodes(session, label: str):
-    """Generic function to get all nodes of a label"""
-    query = f"MATCH (n:{label}) RETURN n"
-    result = session.run(query)
-    return [node_to_dict(record['n']) for record in result]
-
-def update_node(session, label: str, node_id: str, properties: dict):
-    """Generic function to update a node"""
-    # Filter out None values
-    properties = {k: v for k, v in properties.items() if v is not None}
-    if not properties:
-        return get_node(session, label, node_id)
-
-    set_clauses = [f"n.{key} = ${key}" for key in properties.keys()]
-    print(properties)
-    query = f"MATCH (n:{label}) WHERE n.number = $id SET {', '.join(set_clauses)} RETURN n"
-    print(query)
-    print(node_id)
-    result = session.run(query, id=int(node_id), **properties)
-    record = result.single()
-    print(record)
-    if record:
-        return node_to_dict(record['n'])
+async def create_nodes_batch(session, label: str, rows: List[dict]):
+    """Generic function to create many nodes in one round trip"""
+    query = _QUERIES[label]["create_batch"]
+    records = await session.execute_write(fetch_records, query, {"rows": rows})
+    return [record['n'] for record in records]
+
+async def get_node(session, label: str, node_id: int):
+    """Generic function to get a node by its number"""
+    logger.debug("get_node label=%s id=%s", label, node_id)
+    query = _QUERIES[label]["get"]
+    records = await session.execute_read(fetch_records, query, {"id": node_id})
+    if records:
+        return records[0]['n']
     return None
 
-def delete_node(session, label: str, node_id: str):
-    """Generic function to delete a node"""
-    query = f"MATCH (n:{label}) WHERE elementId(n) = $id DETACH DELETE n"
-    result = session.run(query, id=node_id)
-    return result.consume().counters.nodes_deleted > 0
-
-def create_relationship(session, from_label: str, to_label: str, relationship_type: str, from_id: str, to_id: str):
-    """Generic function to create a relationship"""
-    query = f"""
-    MATCH (from:{from_label}) WHERE from.name = $from_id
-    MATCH (to:{to_label}) WHERE to.name = $to_id
-    CREATE (from)-[r:{relationship_type}]->(to)
-    RETURN r, from, to
+async def stream_all_nodes(label: str):
     """
-    result = session.run(query, from_id=from_id, to_id=to_id)
-    record = result.single()
-    if record:
-        return relationship_to_dict(record['r'])
-    return None
-
-def get_relationship(session, relationship_type: str, rel_id: str):
-    """Generic function to get a relationship by ID"""
-    query = f"MATCH ()-[r:{relationship_type}]-() WHERE elementId(r) = $id RETURN r, startNode(r) as from, endNode(r) as to"
-    result = session.run(query, id=rel_id)
-    record = result.single()
-    if record:
-        return relationship_to_dict(record['r'])
-    return None
-
-def get_all_relationships(session, relationship_type: str):
-    """Generic function to get all relationships of a type"""
-    query = f"MATCH ()-[r:{relationship_type}]-() RETURN r, startNode(r) as from, endNode(r) as to"
-    result = session.run(query)
-    return [relationship_to_dict(record['r']) for record in result]
-
-def delete_relationship(session, relationship_type: str, rel_id: str):
-    """Generic function to delete a relationship"""
-    query = f"MATCH ()-[r:{relationship_type}]-() WHERE elementId(r) = $id DELETE r"
-    result = session.run(query, id=rel_id)
-    return result.consume().counters.relationships_deleted > 0
-
-# Location endpoints
-@app.post("/locations", response_model=LocationResponse)
-async def create_location(location: LocationCreate):
-    try:
-        with get_db_session() as session:
-            result = create_node(session, "Location", location.dict())
-            if result:
-                return LocationResponse(**result)
-            raise HTTPException(status_code=500, detail="Failed to create location")
-    except Exception as e:
-        logger.error(f"Error creating location: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.get("/locations", response_model=List[LocationResponse])
-async def get_locations():
-    try:
-        with get_db_session() as session:
-            results = get_all_nodes(session, "Location")
-            return [LocationResponse(**result) for result in results]
-    except Exception as e:
-        logger.error(f"Error getting locations: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.get("/locations/{location_id}", response_model=LocationResponse)
-async def get_location(location_id: str):
-    try:
-        with get_db_session() as session:
-            result = get_node(session, "Location", location_id)
-            if result:
-                return LocationResponse(**result)
-            raise HTTPException(status_code=404, detail="Location not found")
-    except Exception as e:
-        logger.error(f"Error getting location: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.put("/locations/{location_id}", response_model=LocationResponse)
-async def update_location(location_id: str, location: LocationUpdate):
+    Start the list query for a label and return a StreamingResponse that encodes the rows
+    as they arrive, so the full list is never held in memory. The response owns its own
+    session, as it outlives the request's dependencies.
+    """
+    session = driver.session(database=NEO4J_DATABASE, default_access_mode=READ_ACCESS)
     try:
-        with get_db_session() as session:
-            result = update_node(session, "Location", location_id, location.dict())
-            if result:
-                return LocationResponse(**result)
-            raise HTTPException(status_code=404, detail="Location not found")
-    except Exception as e:
-        logger.error(f"Error updating location: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        result = await session.run(_QUERIES[label]["get_all"])
+    except Exception:
+        await session.close()
+        raise
+    return StreamingResponse(_json_array_chunks(session, result), media_type="application/json")
 
-@app.delete("/locations/{location_id}")
-async def delete_location(location_id: str):
+async def _json_array_chunks(session, result):
+    """Yield a JSON array of the n column, STREAM_CHUNK_ROWS records per chunk, then close the session"""
     try:
-        with get_db_session() as session:
-            success = delete_node(session, "Location", location_id)
-            if success:
-                return {"message": "Location deleted successfully"}
-            raise HTTPException(status_code=404, detail="Location not found")
-    except Exception as e:
-        logger.error(f"Error deleting location: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        yield b"["
+        separator = b""
+        while records := await result.fetch(STREAM_CHUNK_ROWS):
+            yield separator + b",".join(orjson.dumps(record['n'], default=_orjson_default) for record in records)
+            separator = b","
+        yield b"]"
+    finally:
+        await session.close()
+
+async def get_nodes_batch(session, label: str, ids: List[int]):
+    """Generic function to get many nodes by ID in one round trip; IDs with no node are skipped"""
+    query = _QUERIES[label]["get_batch"]
+    records = await session.execute_read(fetch_records, query, {"ids": ids})
+    return [record['n'] for record in records]
+
+async def update_node(session, label: str, node_id: int, properties: dict):
+    """Generic function to update a node; properties must not be empty"""
+    logger.debug("update_node label=%s id=%s keys=%s", label, node_id, properties.keys())
+    query = _QUERIES[label]["update"]
+    records = await session.execute_write(fetch_records, query, {"id": node_id, "props": properties})
+    if records:
+        return records[0]['n']
+    return None
 
-# Course endpoints
-@app.post("/courses", response_model=CourseResponse)
-async def create_course(course: CourseCreate):
-    try:
-        with get_db_session() as session:
-            result = create_node(session, "Course", course.dict())
-            if result:
-                return CourseResponse(**result)
-            raise HTTPException(status_code=500, detail="Failed to create course")
-    except Exception as e:
-        logger.error(f"Error creating course: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+async def delete_node(session, label: str, node_id: str):
+    """Generic function to delete a node"""
+    query = _QUERIES[label]["delete"]
+    summary = await session.execute_write(consume_summary, query, {"id": node_id})
+    return summary.counters.nodes_deleted > 0
+
+async def create_relationship(session, slug: str, from_id: str, to_id: str):
+    """Generic function to create a relationship of one kind; MERGE makes repeating the call a no-op"""
+    query = _RELATIONSHIP_QUERIES[slug]["create"]
+    records = await session.execute_write(fetch_records, query, {"from_id": from_id, "to_id": to_id})
+    if records:
+        record = records[0]
+        return relationship_with_nodes_to_dict(record['r'], record['from_node'], record['to_node'])
+    return None
 
-@app.get("/courses", response_model=List[CourseResponse])
-async def get_courses():
-    try:
-        with get_db_session() as session:
-            results = get_all_nodes(session, "Course")
-            return [CourseResponse(**result) for result in results]
-    except Exception as e:
-        logger.error(f"Error getting courses: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+async def create_relationships_batch(session, slug: str, pairs: List[dict]):
+    """Generic function to create many relationships of one kind in one round trip; pairs whose nodes don't exist are skipped"""
+    query = _RELATIONSHIP_QUERIES[slug]["create_batch"]
+    records = await session.execute_write(fetch_records, query, {"pairs": pairs})
+    return [relationship_to_dict(record['r']) for record in records]
+
+async def get_relationship(session, slug: str, rel_id: str):
+    """Generic function to get a relationship of one kind by ID"""
+    query = _RELATIONSHIP_QUERIES[slug]["get"]
+    records = await session.execute_read(fetch_records, query, {"id": rel_id})
+    if records:
+        return relationship_to_dict(records[0]['r'])
+    return None
 
-@app.get("/courses/{course_id}", response_model=CourseResponse)
-async def get_course(course_id: str):
-    try:
-        with get_db_session() as session:
-            result = get_node(session, "Course", course_id)
-            if result:
-                return CourseResponse(**result)
-            raise HTTPException(status_code=404, detail="Course not found")
-    except Exception as e:
-        logger.error(f"Error getting course: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+async def get_all_relationships(session, slug: str):
+    """Generic function to get all relationships of one kind, by its RELATIONSHIPS slug"""
+    query = _RELATIONSHIP_QUERIES[slug]["get_all"]
+    records = await session.execute_read(fetch_records, query, {})
+    return [relationship_to_dict(record['r']) for record in records]
 
-@app.put("/courses/{course_id}", response_model=CourseResponse)
-async def update_course(course_id: str, course: CourseUpdate):
-    try:
-        with get_db_session() as session:
-            result = update_node(session, "Course", course_id, course.dict())
-            if result:
-                return CourseResponse(**result)
-            raise HTTPException(status_code=404, detail="Course not found")
-    except Exception as e:
-        logger.error(f"Error updating course: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+async def delete_relationship(session, slug: str, rel_id: str):
+    """Generic function to delete a relationship of one kind, by its RELATIONSHIPS slug"""
+    query = _RELATIONSHIP_QUERIES[slug]["delete"]
+    summary = await session.execute_write(consume_summary, query, {"id": rel_id})
+    return summary.counters.relationships_deleted > 0
 
-@app.delete("/courses/{course_id}")
-async def delete_course(course_id: str):
-    try:
-        with get_db_session() as session:
-            success = delete_node(session, "Course", course_id)
-            if success:
-                return {"message": "Course deleted successfully"}
-            raise HTTPException(status_code=404, detail="Course not found")
-    except Exception as e:
-        logger.error(f"Error deleting course: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+def register_crud(app, label: str, prefix: str, create_model, update_model, response_model, name: str, plural: str):
+    """
+    Register the standard endpoints for one node label under /{prefix}:
+    create, bulk create, list, batch lookup, get, update and delete.
+    name and plural are the human-readable singular and plural used in messages and route names.
+    Get and update look the node up by its number; delete takes its element ID.
+    """
+    slug = name.replace(" ", "_")
+    plural_slug = plural.replace(" ", "_")
+    not_found = f"{name.capitalize()} not found"
+
+    async def create(payload: create_model, session=Depends(get_db_session)):
+        result = await create_node(session, label, payload.model_dump())
+        invalidate_cache(label)
+        if result:
+            return result
+        raise HTTPException(status_code=500, detail=f"Failed to create {name}")
+
+    async def create_bulk(payloads: List[create_model], session=Depends(get_db_session)):
+        results = await create_nodes_batch(session, label, [payload.model_dump() for payload in payloads])
+        invalidate_cache(label)
+        return GraphJSONResponse(results)
+
+    async def get_all():
+        return await stream_all_nodes(label)
+
+    async def get_batch(request: NodeBatchRequest, session=Depends(get_db_session)):
+        results = await get_nodes_batch(session, label, request.ids)
+        return GraphJSONResponse(results)
+
+    async def get_one(node_id: int, session=Depends(get_db_session)):
+        result = await cached_get((label, node_id), lambda: get_node(session, label, node_id))
+        if result:
+            return result
+        raise HTTPException(status_code=404, detail=not_found)
+
+    async def update(node_id: int, payload: update_model, session=Depends(get_db_session)):
+        properties = payload.model_dump(exclude_unset=True, exclude_none=True)
+        if not properties:
+            raise HTTPException(status_code=400, detail="No fields to update")
+        result = await update_node(session, label, node_id, properties)
+        invalidate_cache(label)
+        if result:
+            return result
+        raise HTTPException(status_code=404, detail=not_found)
+
+    async def delete(node_id: str, session=Depends(get_db_session)):
+        success = await delete_node(session, label, node_id)
+        # DETACH DELETE also removes the node's relationships, so every cached list may be stale
+        clear_cache()
+        if success:
+            return {"message": f"{name.capitalize()} deleted successfully"}
+        raise HTTPException(status_code=404, detail=not_found)
+
+    app.add_api_route(f"/{prefix}", create, methods=["POST"], response_model=response_model, name=f"create_{slug}")
+    app.add_api_route(f"/{prefix}/bulk", create_bulk, methods=["POST"], response_model=List[response_model],
+                      name=f"create_{plural_slug}", description=f"Create many {plural} in one query")
+    app.add_api_route(f"/{prefix}", get_all, methods=["GET"], response_model=List[response_model], name=f"get_{plural_slug}")
+    app.add_api_route(f"/{prefix}/batch", get_batch, methods=["POST"], response_model=List[response_model],
+                      name=f"get_{plural_slug}_batch", description=f"Get many {plural} by number in one query")
+    app.add_api_route(f"/{prefix}/{{node_id}}", get_one, methods=["GET"], response_model=response_model, name=f"get_{slug}")
+    app.add_api_route(f"/{prefix}/{{node_id}}", update, methods=["PUT"], response_model=response_model, name=f"update_{slug}")
+    app.add_api_route(f"/{prefix}/{{node_id}}", delete, methods=["DELETE"], name=f"delete_{slug}")
+
+# Node endpoints
+register_crud(app, "Location", "locations", LocationCreate, LocationUpdate, LocationResponse, "location", "locations")
+register_crud(app, "Course", "courses", CourseCreate, CourseUpdate, CourseResponse, "course", "courses")
+register_crud(app, "Hole", "holes", HoleCreate, HoleUpdate, HoleResponse, "hole", "holes")
+register_crud(app, "Tournament", "tournaments", TournamentCreate, TournamentUpdate, TournamentResponse, "tournament", "tournaments")
+register_crud(app, "Team", "teams", TeamCreate, TeamUpdate, TeamResponse, "team", "teams")
+register_crud(app, "Department", "departments", DepartmentCreate, DepartmentUpdate, DepartmentResponse, "department", "departments")
+register_crud(app, "Player", "players", PlayerCreate, PlayerUpdate, PlayerResponse, "player", "players")
+register_crud(app, "TeamRound", "team-rounds", TeamRoundCreate, TeamRoundUpdate, TeamRoundResponse, "team round", "team rounds")
+register_crud(app, "PlayerRound", "player-rounds", PlayerRoundCreate, PlayerRoundUpdate, PlayerRoundResponse, "player round", "player rounds")
 
 @app.get("/courses/{course_name}/holes", response_model=List[HoleResponse])
-async def get_holes_for_course(course_name: str):
+async def get_holes_for_course(course_name: str, session=Depends(get_db_session)):
     """Get all holes for a specific course by course name"""
-    try:
-        with get_db_session() as session:
-            query = """
-            MATCH (c:Course {name: $course_name})-[:HAS_HOLE]->(h:Hole)
-            RETURN h
-            ORDER BY h.number
-            """
-            result = session.run(query, course_name=course_name)
-
-            holes = []
-            for record in result:
-                hole_dict = node_to_dict(record['h'])
-                holes.append(HoleResponse(**hole_dict))
-
-            if not holes:
-                # Check if course exists
-                course_check = session.run("MATCH (c:Course {name: $course_name}) RETURN c", course_name=course_name)
-                if not course_check.single():
-                    raise HTTPException(status_code=404, detail=f"Course '{course_name}' not found")
-                # Course exists but has no holes
-                return []
-
-            return holes
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error getting holes for course '{course_name}': {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-# Hole endpoints
-@app.post("/holes", response_model=HoleResponse)
-async def create_hole(hole: HoleCreate):
-    try:
-        with get_db_session() as session:
-            result = create_node(session, "Hole", hole.dict())
-            if result:
-                return HoleResponse(**result)
-            raise HTTPException(status_code=500, detail="Failed to create hole")
-    except Exception as e:
-        logger.error(f"Error creating hole: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.get("/holes", response_model=List[HoleResponse])
-async def get_holes():
-    try:
-        with get_db_session() as session:
-            results = get_all_nodes(session, "Hole")
-            return [HoleResponse(**result) for result in results]
-    except Exception as e:
-        logger.error(f"Error getting holes: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.get("/holes/{hole_id}", response_model=HoleResponse)
-async def get_hole(hole_id: str):
-    try:
-        with get_db_session() as session:
-            result = get_node(session, "Hole", hole_id)
-            if result:
-                return HoleResponse(**result)
-            raise HTTPException(status_code=404, detail="Hole not found")
-    except Exception as e:
-        logger.error(f"Error getting hole: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.put("/holes/{hole_id}", response_model=HoleResponse)
-async def update_hole(hole_id: str, hole: HoleUpdate):
-    try:
-        with get_db_session() as session:
-            result = update_node(session, "Hole", hole_id, hole.dict())
-            if result:
-                return HoleResponse(**result)
-            raise HTTPException(status_code=404, detail="Hole not found")
-    except Exception as e:
-        logger.error(f"Error updating hole: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.delete("/holes/{hole_id}")
-async def delete_hole(hole_id: str):
-    try:
-        with get_db_session() as session:
-            success = delete_node(session, "Hole", hole_id)
-            if success:
-                return {"message": "Hole deleted successfully"}
-            raise HTTPException(status_code=404, detail="Hole not found")
-    except Exception as e:
-        logger.error(f"Error deleting hole: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-# Tournament endpoints
-@app.post("/tournaments", response_model=TournamentResponse)
-async def create_tournament(tournament: TournamentCreate):
-    try:
-        with get_db_session() as session:
-            result = create_node(session, "Tournament", tournament.dict())
-            if result:
-                return TournamentResponse(**result)
-            raise HTTPException(status_code=500, detail="Failed to create tournament")
-    except Exception as e:
-        logger.error(f"Error creating tournament: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.get("/tournaments", response_model=List[TournamentResponse])
-async def get_tournaments():
-    try:
-        with get_db_session() as session:
-            results = get_all_nodes(session, "Tournament")
-            return [TournamentResponse(**result) for result in results]
-    except Exception as e:
-        logger.error(f"Error getting tournaments: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.get("/tournaments/{tournament_id}", response_model=TournamentResponse)
-async def get_tournament(tournament_id: str):
-    try:
-        with get_db_session() as session:
-            result = get_node(session, "Tournament", tournament_id)
-            if result:
-                return TournamentResponse(**result)
-            raise HTTPException(status_code=404, detail="Tournament not found")
-    except Exception as e:
-        logger.error(f"Error getting tournament: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.put("/tournaments/{tournament_id}", response_model=TournamentResponse)
-async def update_tournament(tournament_id: str, tournament: TournamentUpdate):
-    try:
-        with get_db_session() as session:
-            result = update_node(session, "Tournament", tournament_id, tournament.dict())
-            if result:
-                return TournamentResponse(**result)
-            raise HTTPException(status_code=404, detail="Tournament not found")
-    except Exception as e:
-        logger.error(f"Error updating tournament: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.delete("/tournaments/{tournament_id}")
-async def delete_tournament(tournament_id: str):
-    try:
-        with get_db_session() as session:
-            success = delete_node(session, "Tournament", tournament_id)
-            if success:
-                return {"message": "Tournament deleted successfully"}
-            raise HTTPException(status_code=404, detail="Tournament not found")
-    except Exception as e:
-        logger.error(f"Error deleting tournament: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-# Team endpoints
-@app.post("/teams", response_model=TeamResponse)
-async def create_team(team: TeamCreate):
-    try:
-        with get_db_session() as session:
-            result = create_node(session, "Team", team.dict())
-            if result:
-                return TeamResponse(**result)
-            raise HTTPException(status_code=500, detail="Failed to create team")
-    except Exception as e:
-        logger.error(f"Error creating team: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    # One round trip for both the holes and whether the course exists at all
+    query = """
+    OPTIONAL MATCH (c:Course {name: $course_name})
+    OPTIONAL MATCH (c)-[:HAS_HOLE]->(h:Hole)
+    WITH c, h ORDER BY h.number
+    RETURN count(c) > 0 AS exists, collect(h{.*, id: elementId(h)}) AS holes
+    """
+    records = await session.execute_read(fetch_records, query, {"course_name": course_name})
 
-@app.get("/teams", response_model=List[TeamResponse])
-async def get_teams():
-    try:
-        with get_db_session() as session:
-            results = get_all_nodes(session, "Team")
-            return [TeamResponse(**result) for result in results]
-    except Exception as e:
-        logger.error(f"Error getting teams: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    if not records[0]['exists']:
+        raise HTTPException(status_code=404, detail=f"Course '{course_name}' not found")
 
-@app.get("/teams/{team_id}", response_model=TeamResponse)
-async def get_team(team_id: str):
-    try:
-        with get_db_session() as session:
-            result = get_node(session, "Team", team_id)
-            if result:
-                return TeamResponse(**result)
-            raise HTTPException(status_code=404, detail="Team not found")
-    except Exception as e:
-        logger.error(f"Error getting team: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.put("/teams/{team_id}", response_model=TeamResponse)
-async def update_team(team_id: str, team: TeamUpdate):
-    try:
-        with get_db_session() as session:
-            result = update_node(session, "Team", team_id, team.dict())
-            if result:
-                return TeamResponse(**result)
-            raise HTTPException(status_code=404, detail="Team not found")
-    except Exception as e:
-        logger.error(f"Error updating team: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.delete("/teams/{team_id}")
-async def delete_team(team_id: str):
-    try:
-        with get_db_session() as session:
-            success = delete_node(session, "Team", team_id)
-            if success:
-                return {"message": "Team deleted successfully"}
-            raise HTTPException(status_code=404, detail="Team not found")
-    except Exception as e:
-        logger.error(f"Error deleting team: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return GraphJSONResponse(records[0]['holes'])
 
 @app.get("/teams/{team_number}/players", response_model=List[PlayerResponse])
-async def get_players_for_team(team_number: int):
-    """Get all holes for a specific course by course name"""
-    try:
-        with get_db_session() as session:
-            query = """
-            MATCH (p:Player)-[:MEMBER_OF]->(t:Team {number: $team_number})
-            RETURN p
-            ORDER BY p.name
-            """
-            result = session.run(query, team_number=team_number)
-
-            players = []
-            for record in result:
-                player_dict = node_to_dict(record['p'])
-                players.append(PlayerResponse(**player_dict))
-
-            if not players:
-                # Check if team exists
-                team_check = session.run("MATCH (t:Team {number: $team_number}) RETURN t", team_number=str(team_number))
-                if not team_check.single():
-                    raise HTTPException(status_code=404, detail=f"Team '{str(team_number)}' not found")
-                # Team exists but has no players
-                return []
-
-            return players
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error getting players for team '{str(team_number)}': {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-# Department endpoints
-@app.post("/departments", response_model=DepartmentResponse)
-async def create_department(department: DepartmentCreate):
-    try:
-        with get_db_session() as session:
-            result = create_node(session, "Department", department.dict())
-            if result:
-                return DepartmentResponse(**result)
-            raise HTTPException(status_code=500, detail="Failed to create department")
-    except Exception as e:
-        logger.error(f"Error creating department: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.get("/departments", response_model=List[DepartmentResponse])
-async def get_departments():
-    try:
-        with get_db_session() as session:
-            results = get_all_nodes(session, "Department")
-            return [DepartmentResponse(**result) for result in results]
-    except Exception as e:
-        logger.error(f"Error getting departments: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.get("/departments/{department_id}", response_model=DepartmentResponse)
-async def get_department(department_id: str):
-    try:
-        with get_db_session() as session:
-            result = get_node(session, "Department", department_id)
-            if result:
-                return DepartmentResponse(**result)
-            raise HTTPException(status_code=404, detail="Department not found")
-    except Exception as e:
-        logger.error(f"Error getting department: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.put("/departments/{department_id}", response_model=DepartmentResponse)
-async def update_department(department_id: str, department: DepartmentUpdate):
-    try:
-        with get_db_session() as session:
-            result = update_node(session, "Department", department_id, department.dict())
-            if result:
-                return DepartmentResponse(**result)
-            raise HTTPException(status_code=404, detail="Department not found")
-    except Exception as e:
-        logger.error(f"Error updating department: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.delete("/departments/{department_id}")
-async def delete_department(department_id: str):
-    try:
-        with get_db_session() as session:
-            success = delete_node(session, "Department", department_id)
-            if success:
-                return {"message": "Department deleted successfully"}
-            raise HTTPException(status_code=404, detail="Department not found")
-    except Exception as e:
-        logger.error(f"Error deleting department: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-# Player endpoints
-@app.post("/players", response_model=PlayerResponse)
-async def create_player(player: PlayerCreate):
-    try:
-        with get_db_session() as session:
-            result = create_node(session, "Player", player.dict())
-            if result:
-                return PlayerResponse(**result)
-            raise HTTPException(status_code=500, detail="Failed to create player")
-    except Exception as e:
-        logger.error(f"Error creating player: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.get("/players", response_model=List[PlayerResponse])
-async def get_players():
-    try:
-        with get_db_session() as session:
-            results = get_all_nodes(session, "Player")
-            return [PlayerResponse(**result) for result in results]
-    except Exception as e:
-        logger.error(f"Error getting players: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.get("/players/{player_id}", response_model=PlayerResponse)
-async def get_player(player_id: str):
-    try:
-        with get_db_session() as session:
-            result = get_node(session, "Player", player_id)
-            if result:
-                return PlayerResponse(**result)
-            raise HTTPException(status_code=404, detail="Player not found")
-    except Exception as e:
-        logger.error(f"Error getting player: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.put("/players/{player_id}", response_model=PlayerResponse)
-async def update_player(player_id: str, player: PlayerUpdate):
-    try:
-        with get_db_session() as session:
-            result = update_node(session, "Player", player_id, {'name':player.name})
-            if result:
-                return PlayerResponse(**result)
-            raise HTTPException(status_code=404, detail="Player not found")
-    except Exception as e:
-        logger.error(f"Error updating player: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.delete("/players/{player_id}")
-async def delete_player(player_id: str):
-    try:
-        with get_db_session() as session:
-            success = delete_node(session, "Player", player_id)
-            if success:
-                return {"message": "Player deleted successfully"}
-            raise HTTPException(status_code=404, detail="Player not found")
-    except Exception as e:
-        logger.error(f"Error deleting player: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-# TeamRound endpoints
-@app.post("/team-rounds", response_model=TeamRoundResponse)
-async def create_team_round(team_round: TeamRoundCreate):
-    try:
-        with get_db_session() as session:
-            result = create_node(session, "TeamRound", team_round.dict())
-            if result:
-                return TeamRoundResponse(**result)
-            raise HTTPException(status_code=500, detail="Failed to create team round")
-    except Exception as e:
-        logger.error(f"Error creating team round: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.get("/team-rounds", response_model=List[TeamRoundResponse])
-async def get_team_rounds():
-    try:
-        with get_db_session() as session:
-            results = get_all_nodes(session, "TeamRound")
-            return [TeamRoundResponse(**result) for result in results]
-    except Exception as e:
-        logger.error(f"Error getting team rounds: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.get("/team-rounds/{team_round_id}", response_model=TeamRoundResponse)
-async def get_team_round(team_round_id: str):
-    try:
-        with get_db_session() as session:
-            result = get_node(session, "TeamRound", team_round_id)
-            if result:
-                return TeamRoundResponse(**result)
-            raise HTTPException(status_code=404, detail="Team round not found")
-    except Exception as e:
-        logger.error(f"Error getting team round: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.put("/team-rounds/{team_round_id}", response_model=TeamRoundResponse)
-async def update_team_round(team_round_id: str, team_round: TeamRoundUpdate):
-    try:
-        with get_db_session() as session:
-            result = update_node(session, "TeamRound", team_round_id, team_round.dict())
-            if result:
-                return TeamRoundResponse(**result)
-            raise HTTPException(status_code=404, detail="Team round not found")
-    except Exception as e:
-        logger.error(f"Error updating team round: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.delete("/team-rounds/{team_round_id}")
-async def delete_team_round(team_round_id: str):
-    try:
-        with get_db_session() as session:
-            success = delete_node(session, "TeamRound", team_round_id)
-            if success:
-                return {"message": "Team round deleted successfully"}
-            raise HTTPException(status_code=404, detail="Team round not found")
-    except Exception as e:
-        logger.error(f"Error deleting team round: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-# PlayerRound endpoints
-@app.post("/player-rounds", response_model=PlayerRoundResponse)
-async def create_player_round(player_round: PlayerRoundCreate):
-    try:
-        with get_db_session() as session:
-            result = create_node(session, "PlayerRound", player_round.dict())
-            if result:
-                return PlayerRoundResponse(**result)
-            raise HTTPException(status_code=500, detail="Failed to create player round")
-    except Exception as e:
-        logger.error(f"Error creating player round: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.get("/player-rounds", response_model=List[PlayerRoundResponse])
-async def get_player_rounds():
-    try:
-        with get_db_session() as session:
-            results = get_all_nodes(session, "PlayerRound")
-            return [PlayerRoundResponse(**result) for result in results]
-    except Exception as e:
-        logger.error(f"Error getting player rounds: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.get("/player-rounds/{player_round_id}", response_model=PlayerRoundResponse)
-async def get_player_round(player_round_id: str):
-    try:
-        with get_db_session() as session:
-            result = get_node(session, "PlayerRound", player_round_id)
-            if result:
-                return PlayerRoundResponse(**result)
-            raise HTTPException(status_code=404, detail="Player round not found")
-    except Exception as e:
-        logger.error(f"Error getting player round: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.put("/player-rounds/{player_round_id}", response_model=PlayerRoundResponse)
-async def update_player_round(player_round_id: str, player_round: PlayerRoundUpdate):
-    try:
-        with get_db_session() as session:
-            result = update_node(session, "PlayerRound", player_round_id, player_round.dict())
-            if result:
-                return PlayerRoundResponse(**result)
-            raise HTTPException(status_code=404, detail="Player round not found")
-    except Exception as e:
-        logger.error(f"Error updating player round: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.delete("/player-rounds/{player_round_id}")
-async def delete_player_round(player_round_id: str):
-    try:
-        with get_db_session() as session:
-            success = delete_node(session, "PlayerRound", player_round_id)
-            if success:
-                return {"message": "Player round deleted successfully"}
-            raise HTTPException(status_code=404, detail="Player round not found")
-    except Exception as e:
-        logger.error(f"Error deleting player round: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-# Relationship endpoints
-
-# Location-[:HAS_COURSE]->Course
-@app.post("/relationships/location-has-course", response_model=RelationshipResponse)
-async def create_location_has_course(relationship: RelationshipCreate):
-    try:
-        with get_db_session() as session:
-            result = create_relationship(session, "Location", "Course", "HAS_COURSE", 
-                                       relationship.from_id, relationship.to_id)
-            if result:
-                return RelationshipResponse(**result)
-            raise HTTPException(status_code=500, detail="Failed to create relationship")
-    except Exception as e:
-        logger.error(f"Error creating location-has-course relationship: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.get("/relationships/location-has-course", response_model=List[RelationshipResponse])
-async def get_location_has_course_relationships():
-    try:
-        with get_db_session() as session:
-            results = get_all_relationships(session, "HAS_COURSE")
-            return [RelationshipResponse(**result) for result in results]
-    except Exception as e:
-        logger.error(f"Error getting location-has-course relationships: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.delete("/relationships/location-has-course/{relationship_id}")
-async def delete_location_has_course(relationship_id: str):
-    try:
-        with get_db_session() as session:
-            success = delete_relationship(session, "HAS_COURSE", relationship_id)
-            if success:
-                return {"message": "Relationship deleted successfully"}
-            raise HTTPException(status_code=404, detail="Relationship not found")
-    except Exception as e:
-        logger.error(f"Error deleting location-has-course relationship: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-# Course-[:HAS_HOLE]->Hole
-@app.post("/relationships/course-has-hole", response_model=RelationshipResponse)
-async def create_course_has_hole(relationship: RelationshipCreate):
-    try:
-        with get_db_session() as session:
-            result = create_relationship(session, "Course", "Hole", "HAS_HOLE", 
-                                       relationship.from_id, relationship.to_id)
-            if result:
-                return RelationshipResponse(**result)
-            raise HTTPException(status_code=500, detail="Failed to create relationship")
-    except Exception as e:
-        logger.error(f"Error creating course-has-hole relationship: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.get("/relationships/course-has-hole", response_model=List[RelationshipResponse])
-async def get_course_has_hole_relationships():
-    try:
-        with get_db_session() as session:
-            results = get_all_relationships(session, "HAS_HOLE")
-            return [RelationshipResponse(**result) for result in results]
-    except Exception as e:
-        logger.error(f"Error getting course-has-hole relationships: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.delete("/relationships/course-has-hole/{relationship_id}")
-async def delete_course_has_hole(relationship_id: str):
-    try:
-        with get_db_session() as session:
-            success = delete_relationship(session, "HAS_HOLE", relationship_id)
-            if success:
-                return {"message": "Relationship deleted successfully"}
-            raise HTTPException(status_code=404, detail="Relationship not found")
-    except Exception as e:
-        logger.error(f"Error deleting course-has-hole relationship: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-# Tournament-[:HAS_TEAM]->Team
-@app.post("/relationships/tournament-has-team", response_model=RelationshipResponse)
-async def create_tournament_has_team(relationship: RelationshipCreate):
-    try:
-        with get_db_session() as session:
-            result = create_relationship(session, "Tournament", "Team", "HAS_TEAM", 
-                                       relationship.from_id, relationship.to_id)
-            if result:
-                return RelationshipResponse(**result)
-            raise HTTPException(status_code=500, detail="Failed to create relationship")
-    except Exception as e:
-        logger.error(f"Error creating tournament-has-team relationship: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.get("/relationships/tournament-has-team", response_model=List[RelationshipResponse])
-async def get_tournament_has_team_relationships():
-    try:
-        with get_db_session() as session:
-            results = get_all_relationships(session, "HAS_TEAM")
-            return [RelationshipResponse(**result) for result in results]
-    except Exception as e:
-        logger.error(f"Error getting tournament-has-team relationships: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.delete("/relationships/tournament-has-team/{relationship_id}")
-async def delete_tournament_has_team(relationship_id: str):
-    try:
-        with get_db_session() as session:
-            success = delete_relationship(session, "HAS_TEAM", relationship_id)
-            if success:
-                return {"message": "Relationship deleted successfully"}
-            raise HTTPException(status_code=404, detail="Relationship not found")
-    except Exception as e:
-        logger.error(f"Error deleting tournament-has-team relationship: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-# TeamRound-[:IN_TOURNAMENT]->Tournament
-@app.post("/relationships/teamround-in-tournament", response_model=RelationshipResponse)
-async def create_teamround_in_tournament(relationship: RelationshipCreate):
-    try:
-        with get_db_session() as session:
-            result = create_relationship(session, "TeamRound", "Tournament", "IN_TOURNAMENT", 
-                                       relationship.from_id, relationship.to_id)
-            if result:
-                return RelationshipResponse(**result)
-            raise HTTPException(status_code=500, detail="Failed to create relationship")
-    except Exception as e:
-        logger.error(f"Error creating teamround-in-tournament relationship: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.get("/relationships/teamround-in-tournament", response_model=List[RelationshipResponse])
-async def get_teamround_in_tournament_relationships():
-    try:
-        with get_db_session() as session:
-            results = get_all_relationships(session, "IN_TOURNAMENT")
-            return [RelationshipResponse(**result) for result in results]
-    except Exception as e:
-        logger.error(f"Error getting teamround-in-tournament relationships: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.delete("/relationships/teamround-in-tournament/{relationship_id}")
-async def delete_teamround_in_tournament(relationship_id: str):
-    try:
-        with get_db_session() as session:
-            success = delete_relationship(session, "IN_TOURNAMENT", relationship_id)
-            if success:
-                return {"message": "Relationship deleted successfully"}
-            raise HTTPException(status_code=404, detail="Relationship not found")
-    except Exception as e:
-        logger.error(f"Error deleting teamround-in-tournament relationship: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-# Player-[:MEMBER_OF]->Team
-@app.post("/relationships/player-member-of-team", response_model=RelationshipResponse)
-async def create_player_member_of_team(relationship: RelationshipCreate):
-    try:
-        with get_db_session() as session:
-            result = create_relationship(session, "Player", "Team", "MEMBER_OF", 
-                                       relationship.from_id, relationship.to_id)
-            if result:
-                return RelationshipResponse(**result)
-            raise HTTPException(status_code=500, detail="Failed to create relationship")
-    except Exception as e:
-        logger.error(f"Error creating player-member-of-team relationship: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.get("/relationships/player-member-of-team", response_model=List[RelationshipResponse])
-async def get_player_member_of_team_relationships():
-    try:
-        with get_db_session() as session:
-            # Use a more specific query since MEMBER_OF appears in multiple relationships
-            query = "MATCH (p:Player)-[r:MEMBER_OF]->(t:Team) RETURN r, p as from, t as to"
-            result = session.run(query)
-            return [relationship_to_dict(record['r']) for record in result]
-    except Exception as e:
-        logger.error(f"Error getting player-member-of-team relationships: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.delete("/relationships/player-member-of-team/{relationship_id}")
-async def delete_player_member_of_team(relationship_id: str):
-    try:
-        with get_db_session() as session:
-            query = "MATCH (p:Player)-[r:MEMBER_OF]->(t:Team) WHERE elementId(r) = $id DELETE r"
-            result = session.run(query, id=relationship_id)
-            success = result.consume().counters.relationships_deleted > 0
-            if success:
-                return {"message": "Relationship deleted successfully"}
-            raise HTTPException(status_code=404, detail="Relationship not found")
-    except Exception as e:
-        logger.error(f"Error deleting player-member-of-team relationship: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-# Player-[:MEMBER_OF]->Department
-@app.post("/relationships/player-member-of-department", response_model=RelationshipResponse)
-async def create_player_member_of_department(relationship: RelationshipCreate):
-    try:
-        with get_db_session() as session:
-            result = create_relationship(session, "Player", "Department", "MEMBER_OF", 
-                                       relationship.from_id, relationship.to_id)
-            if result:
-                return RelationshipResponse(**result)
-            raise HTTPException(status_code=500, detail="Failed to create relationship")
-    except Exception as e:
-        logger.error(f"Error creating player-member-of-department relationship: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.get("/relationships/player-member-of-department", response_model=List[RelationshipResponse])
-async def get_player_member_of_department_relationships():
-    try:
-        with get_db_session() as session:
-            # Use a more specific query since MEMBER_OF appears in multiple relationships
-            query = "MATCH (p:Player)-[r:MEMBER_OF]->(d:Department) RETURN r, p as from, d as to"
-            result = session.run(query)
-            return [relationship_to_dict(record['r']) for record in result]
-    except Exception as e:
-        logger.error(f"Error getting player-member-of-department relationships: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.delete("/relationships/player-member-of-department/{relationship_id}")
-async def delete_player_member_of_department(relationship_id: str):
-    try:
-        with get_db_session() as session:
-            query = "MATCH (p:Player)-[r:MEMBER_OF]->(d:Department) WHERE elementId(r) = $id DELETE r"
-            result = session.run(query, id=relationship_id)
-            success = result.consume().counters.relationships_deleted > 0
-            if success:
-                return {"message": "Relationship deleted successfully"}
-            raise HTTPException(status_code=404, detail="Relationship not found")
-    except Exception as e:
-        logger.error(f"Error deleting player-member-of-department relationship: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-# Tournament-[:PLAYED_AT]->Location
-@app.post("/relationships/tournament-played-at-location", response_model=RelationshipResponse)
-async def create_tournament_played_at_location(relationship: RelationshipCreate):
-    try:
-        with get_db_session() as session:
-            result = create_relationship(session, "Tournament", "Location", "PLAYED_AT", 
-                                       relationship.from_id, relationship.to_id)
-            if result:
-                return RelationshipResponse(**result)
-            raise HTTPException(status_code=500, detail="Failed to create relationship")
-    except Exception as e:
-        logger.error(f"Error creating tournament-played-at-location relationship: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.get("/relationships/tournament-played-at-location", response_model=List[RelationshipResponse])
-async def get_tournament_played_at_location_relationships():
-    try:
-        with get_db_session() as session:
-            results = get_all_relationships(session, "PLAYED_AT")
-            return [RelationshipResponse(**result) for result in results]
-    except Exception as e:
-        logger.error(f"Error getting tournament-played-at-location relationships: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.delete("/relationships/tournament-played-at-location/{relationship_id}")
-async def delete_tournament_played_at_location(relationship_id: str):
-    try:
-        with get_db_session() as session:
-            success = delete_relationship(session, "PLAYED_AT", relationship_id)
-            if success:
-                return {"message": "Relationship deleted successfully"}
-            raise HTTPException(status_code=404, detail="Relationship not found")
-    except Exception as e:
-        logger.error(f"Error deleting tournament-played-at-location relationship: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-# PlayerRound-[:PLAYED_HOLE]->Hole
-@app.post("/relationships/playerround-played-hole", response_model=RelationshipResponse)
-async def create_playerround_played_hole(relationship: RelationshipCreate):
-    try:
-        with get_db_session() as session:
-            result = create_relationship(session, "PlayerRound", "Hole", "PLAYED_HOLE", 
-                                       relationship.from_id, relationship.to_id)
-            if result:
-                return RelationshipResponse(**result)
-            raise HTTPException(status_code=500, detail="Failed to create relationship")
-    except Exception as e:
-        logger.error(f"Error creating playerround-played-hole relationship: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.get("/relationships/playerround-played-hole", response_model=List[RelationshipResponse])
-async def get_playerround_played_hole_relationships():
-    try:
-        with get_db_session() as session:
-            results = get_all_relationships(session, "PLAYED_HOLE")
-            return [RelationshipResponse(**result) for result in results]
-    except Exception as e:
-        logger.error(f"Error getting playerround-played-hole relationships: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.delete("/relationships/playerround-played-hole/{relationship_id}")
-async def delete_playerround_played_hole(relationship_id: str):
-    try:
-        with get_db_session() as session:
-            success = delete_relationship(session, "PLAYED_HOLE", relationship_id)
-            if success:
-                return {"message": "Relationship deleted successfully"}
-            raise HTTPException(status_code=404, detail="Relationship not found")
-    except Exception as e:
-        logger.error(f"Error deleting playerround-played-hole relationship: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-# Team-[:PLAYED_ROUND]->TeamRound
-@app.post("/relationships/team-played-round", response_model=RelationshipResponse)
-async def create_team_played_round(relationship: RelationshipCreate):
-    try:
-        with get_db_session() as session:
-            result = create_relationship(session, "Team", "TeamRound", "PLAYED_ROUND", 
-                                       relationship.from_id, relationship.to_id)
-            if result:
-                return RelationshipResponse(**result)
-            raise HTTPException(status_code=500, detail="Failed to create relationship")
-    except Exception as e:
-        logger.error(f"Error creating team-played-round relationship: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.get("/relationships/team-played-round", response_model=List[RelationshipResponse])
-async def get_team_played_round_relationships():
-    try:
-        with get_db_session() as session:
-            # Use a more specific query since PLAYED_ROUND appears in multiple relationships
-            query = "MATCH (t:Team)-[r:PLAYED_ROUND]->(tr:TeamRound) RETURN r, t as from, tr as to"
-            result = session.run(query)
-            return [relationship_to_dict(record['r']) for record in result]
-    except Exception as e:
-        logger.error(f"Error getting team-played-round relationships: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.delete("/relationships/team-played-round/{relationship_id}")
-async def delete_team_played_round(relationship_id: str):
-    try:
-        with get_db_session() as session:
-            query = "MATCH (t:Team)-[r:PLAYED_ROUND]->(tr:TeamRound) WHERE elementId(r) = $id DELETE r"
-            result = session.run(query, id=relationship_id)
-            success = result.consume().counters.relationships_deleted > 0
-            if success:
-                return {"message": "Relationship deleted successfully"}
-            raise HTTPException(status_code=404, detail="Relationship not found")
-    except Exception as e:
-        logger.error(f"Error deleting team-played-round relationship: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-# Player-[:PLAYED_ROUND]->PlayerRound
-@app.post("/relationships/player-played-round", response_model=RelationshipResponse)
-async def create_player_played_round(relationship: RelationshipCreate):
-    try:
-        with get_db_session() as session:
-            result = create_relationship(session, "Player", "PlayerRound", "PLAYED_ROUND", 
-                                       relationship.from_id, relationship.to_id)
-            if result:
-                return RelationshipResponse(**result)
-            raise HTTPException(status_code=500, detail="Failed to create relationship")
-    except Exception as e:
-        logger.error(f"Error creating player-played-round relationship: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.get("/relationships/player-played-round", response_model=List[RelationshipResponse])
-async def get_player_played_round_relationships():
-    try:
-        with get_db_session() as session:
-            # Use a more specific query since PLAYED_ROUND appears in multiple relationships
-            query = "MATCH (p:Player)-[r:PLAYED_ROUND]->(pr:PlayerRound) RETURN r, p as from, pr as to"
-            result = session.run(query)
-            return [relationship_to_dict(record['r']) for record in result]
-    except Exception as e:
-        logger.error(f"Error getting player-played-round relationships: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.delete("/relationships/player-played-round/{relationship_id}")
-async def delete_player_played_round(relationship_id: str):
-    try:
-        with get_db_session() as session:
-            query = "MATCH (p:Player)-[r:PLAYED_ROUND]->(pr:PlayerRound) WHERE elementId(r) = $id DELETE r"
-            result = session.run(query, id=relationship_id)
-            success = result.consume().counters.relationships_deleted > 0
-            if success:
-                return {"message": "Relationship deleted successfully"}
-            raise HTTPException(status_code=404, detail="Relationship not found")
-    except Exception as e:
-        logger.error(f"Error deleting player-played-round relationship: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-# PlayerRound-[:PLAYED_ROUND]->TeamRound
-@app.post("/relationships/playerround-played-round-teamround", response_model=RelationshipResponse)
-async def create_playerround_played_round_teamround(relationship: RelationshipCreate):
-    try:
-        with get_db_session() as session:
-            result = create_relationship(session, "PlayerRound", "TeamRound", "PLAYED_ROUND", 
-                                       relationship.from_id, relationship.to_id)
-            if result:
-                return RelationshipResponse(**result)
-            raise HTTPException(status_code=500, detail="Failed to create relationship")
-    except Exception as e:
-        logger.error(f"Error creating playerround-played-round-teamround relationship: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.get("/relationships/playerround-played-round-teamround", response_model=List[RelationshipResponse])
-async def get_playerround_played_round_teamround_relationships():
-    try:
-        with get_db_session() as session:
-            # Use a more specific query since PLAYED_ROUND appears in multiple relationships
-            query = "MATCH (pr:PlayerRound)-[r:PLAYED_ROUND]->(tr:TeamRound) RETURN r, pr as from, tr as to"
-            result = session.run(query)
-            return [relationship_to_dict(record['r']) for record in result]
-    except Exception as e:
-        logger.error(f"Error getting playerround-played-round-teamround relationships: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.delete("/relationships/playerround-played-round-teamround/{relationship_id}")
-async def delete_playerround_played_round_teamround(relationship_id: str):
-    try:
-        with get_db_session() as session:
-            query = "MATCH (pr:PlayerRound)-[r:PLAYED_ROUND]->(tr:TeamRound) WHERE elementId(r) = $id DELETE r"
-            result = session.run(query, id=relationship_id)
-            success = result.consume().counters.relationships_deleted > 0
-            if success:
-                return {"message": "Relationship deleted successfully"}
-            raise HTTPException(status_code=404, detail="Relationship not found")
-    except Exception as e:
-        logger.error(f"Error deleting playerround-played-round-teamround relationship: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-# Tournament-[:USES]->Course
-@app.post("/relationships/tournament-uses-course", response_model=RelationshipResponse)
-async def create_tournament_uses_course(relationship: RelationshipCreate):
-    try:
-        with get_db_session() as session:
-            result = create_relationship(session, "Tournament", "Course", "USES", 
-                                       relationship.from_id, relationship.to_id)
-            if result:
-                return RelationshipResponse(**result)
-            raise HTTPException(status_code=500, detail="Failed to create relationship")
-    except Exception as e:
-        logger.error(f"Error creating tournament-uses-course relationship: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.get("/relationships/tournament-uses-course", response_model=List[RelationshipResponse])
-async def get_tournament_uses_course_relationships():
-    try:
-        with get_db_session() as session:
-            results = get_all_relationships(session, "USES")
-            return [RelationshipResponse(**result) for result in results]
-    except Exception as e:
-        logger.error(f"Error getting tournament-uses-course relationships: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.delete("/relationships/tournament-uses-course/{relationship_id}")
-async def delete_tournament_uses_course(relationship_id: str):
-    try:
-        with get_db_session() as session:
-            success = delete_relationship(session, "USES", relationship_id)
-            if success:
-                return {"message": "Relationship deleted successfully"}
-            raise HTTPException(status_code=404, detail="Relationship not found")
-    except Exception as e:
-        logger.error(f"Error deleting tournament-uses-course relationship: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+async def get_players_for_team(team_number: int, session=Depends(get_db_session)):
+    """Get all players on a specific team by team number"""
+    # One round trip for both the players and whether the team exists at all
+    query = """
+    OPTIONAL MATCH (t:Team {number: $team_number})
+    OPTIONAL MATCH (p:Player)-[:MEMBER_OF]->(t)
+    WITH t, p ORDER BY p.name
+    RETURN count(t) > 0 AS exists, collect(p{.*, id: elementId(p)}) AS players
+    """
+    records = await session.execute_read(fetch_records, query, {"team_number": team_number})
+
+    if not records[0]['exists']:
+        raise HTTPException(status_code=404, detail=f"Team '{str(team_number)}' not found")
+
+    return GraphJSONResponse(records[0]['players'])
+
+# Relationship endpoints, one set of routes for every kind in RELATIONSHIPS
+def relationship_kind(slug: str):
+    """(from label, to label, relationship type) for a route slug, or 404 for an unknown one"""
+    kind = RELATIONSHIPS.get(slug)
+    if kind is None:
+        raise HTTPException(status_code=404, detail=f"Unknown relationship '{slug}'")
+    return kind
+
+@app.post("/relationships/{slug}", response_model=RelationshipResponse)
+async def create_relationship_endpoint(slug: str, relationship: RelationshipCreate, session=Depends(get_db_session)):
+    _, _, relationship_type = relationship_kind(slug)
+    result = await create_relationship(session, slug, relationship.from_id, relationship.to_id)
+    invalidate_cache(relationship_type)
+    if result:
+        return result
+    raise HTTPException(status_code=500, detail="Failed to create relationship")
+
+@app.post("/relationships/{slug}/bulk", response_model=List[RelationshipResponse])
+async def create_relationships_bulk(slug: str, relationships: List[RelationshipCreate], session=Depends(get_db_session)):
+    """Create many relationships of one kind in one query"""
+    _, _, relationship_type = relationship_kind(slug)
+    pairs = [relationship.model_dump() for relationship in relationships]
+    results = await create_relationships_batch(session, slug, pairs)
+    invalidate_cache(relationship_type)
+    return GraphJSONResponse(results)
+
+@app.get("/relationships/{slug}", response_model=List[RelationshipResponse])
+async def get_relationships_endpoint(slug: str, session=Depends(get_db_session)):
+    _, _, relationship_type = relationship_kind(slug)
+    results = await cached_get((relationship_type, slug), lambda: get_all_relationships(session, slug))
+    return GraphJSONResponse(results)
+
+@app.delete("/relationships/{slug}/{relationship_id}")
+async def delete_relationship_endpoint(slug: str, relationship_id: str, session=Depends(get_db_session)):
+    _, _, relationship_type = relationship_kind(slug)
+    success = await delete_relationship(session, slug, relationship_id)
+    invalidate_cache(relationship_type)
+    if success:
+        return {"message": "Relationship deleted successfully"}
+    raise HTTPException(status_code=404, detail="Relationship not found")
 
 # Health check endpoint
+# A healthy result is reused for this long so frequent liveness probes don't each cost a query;
+# failures are never reused, so an outage shows up on the next probe
+HEALTH_CACHE_SECONDS = 1.0
+_last_healthy = None  # (time.monotonic() of the check, response)
+
 @app.get("/health")
-async def health_check():
-    try:
-        with get_db_session() as session:
-            result = session.run("RETURN 1 as test")
-            record = result.single()
-            if record and record['test'] == 1:
-                return {"status": "healthy", "database": "connected"}
-            else:
-                return {"status": "unhealthy", "database": "connection_failed"}
-    except Exception as e:
-        logger.error(f"Health check failed: {e}")
+async def health_check(session=Depends(get_db_session)):
+    global _last_healthy
+    now = time.monotonic()
+    if _last_healthy and now - _last_healthy[0] < HEALTH_CACHE_SECONDS:
+        return _last_healthy[1]
+    try:
+        records = await session.execute_read(fetch_records, "RETURN 1 as test", {})
+        if records and records[0]['test'] == 1:
+            response = {"status": "healthy", "database": "connected"}
+            _last_healthy = (now, response)
+            return response
+        else:
+            return {"status": "unhealthy", "database": "connection_failed"}
+    except Exception as e:
+        logger.error("Health check failed: %s", e)
         return {"status": "unhealthy", "database": "connection_failed", "error": str(e)}
 
-# Cleanup on shutdown
+# Schema for the lookup keys the endpoints match on: n.number in the generic
+# helpers, .name in create_relationship and the course/team lookups
+SCHEMA_STATEMENTS = [
+    "CREATE CONSTRAINT IF NOT EXISTS FOR (n:Team) REQUIRE n.number IS UNIQUE",
+    *(f"CREATE INDEX IF NOT EXISTS FOR (n:{label}) ON (n.number)" for label in NODE_LABELS if label != "Team"),
+    *(f"CREATE INDEX IF NOT EXISTS FOR (n:{label}) ON (n.name)"
+      for label in ("Location", "Course", "Hole", "Tournament", "Team", "Department", "Player")),
+]
+
+async def ensure_indexes():
+    """Create any missing indexes and constraints; failures are logged, not fatal"""
+    async with driver.session(database=NEO4J_DATABASE) as session:
+        for statement in SCHEMA_STATEMENTS:
+            try:
+                result = await session.run(statement)
+                await result.consume()
+            except (DriverError, ValueError) as e:  # Unreachable or unresolvable server; the rest would fail the same way
+                logger.error("Could not create Neo4j indexes: %s", e)
+                return
+            except Exception as e:
+                # e.g. existing duplicate team numbers block the uniqueness constraint
+                logger.warning("Schema statement failed (%s): %s", statement, e)
+
+# Driver lifecycle
+@app.on_event("startup")
+async def startup():
+    global driver
+    driver = AsyncGraphDatabase.driver(
+        NEO4J_URI,
+        auth=(NEO4J_USER, NEO4J_PASSWORD),
+        max_connection_pool_size=NEO4J_MAX_CONNECTION_POOL_SIZE,
+        connection_acquisition_timeout=NEO4J_CONNECTION_ACQUISITION_TIMEOUT,
+        max_connection_lifetime=NEO4J_MAX_CONNECTION_LIFETIME,
+        keep_alive=True
+    )
+    logger.info("Neo4j driver: pool size %s, acquisition timeout %ss, max connection lifetime %ss",
+                NEO4J_MAX_CONNECTION_POOL_SIZE, NEO4J_CONNECTION_ACQUISITION_TIMEOUT, NEO4J_MAX_CONNECTION_LIFETIME)
+
+    # None of these depend on each other, so run them concurrently to shorten cold starts
+    await asyncio.gather(warm_up_driver(), ensure_indexes(), check_static_dirs())
+
+async def warm_up_driver():
+    """Open a first connection now rather than on the first request"""
+    try:
+        await driver.verify_connectivity()
+    except Exception as e:
+        logger.error("Could not connect to Neo4j at startup: %s", e)
+
+async def check_static_dirs():
+    """Warn about missing static directories, stat-ing them off the event loop"""
+    loop = asyncio.get_running_loop()
+    for mount_path, directory in STATIC_DIRS.items():
+        if not await loop.run_in_executor(None, directory.is_dir):
+            logger.warning("Static directory %s for %s does not exist", directory, mount_path)
+
 @app.on_event("shutdown")
 async def shutdown():
-    driver.close()
+    await driver.close()
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, ssl_keyfile="./minigolf.key", ssl_certfile="./minigolf.crt")
+    # One process per core, each with its own event loop, Neo4j pool and GET cache;
+    # uvloop and httptools are the C implementations from uvicorn[standard]
+    # TLS is cheaper terminated by a proxy in front (nginx, Caddy): set SSL_KEYFILE and
+    # SSL_CERTFILE empty to serve plain HTTP to it, and HOST=127.0.0.1 to accept only local connections
+    uvicorn.run("main:app", host=os.getenv("HOST", "0.0.0.0"), port=8000,
+                workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+                loop="uvloop", http="httptools", limit_concurrency=1000, backlog=2048,
+                ssl_keyfile=os.getenv("SSL_KEYFILE", "./minigolf.key") or None,
+                ssl_certfile=os.getenv("SSL_CERTFILE", "./minigolf.crt") or None)
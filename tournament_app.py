@@ -1,4 +1,6 @@
-from fastapi import FastAPI, HTTPException, Response
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse
+from fastapi.encoders import jsonable_encoder
 from neo4j import GraphDatabase
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
@@ -8,13 +10,15 @@ import qrcode
 import io
 import base64
 import json
+import hashlib
+import msgpack
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # FastAPI app
-app = FastAPI(title="Minigolf Tournament Application API", version="1.0.0")
+app = FastAPI(title="Minigolf Tournament Application API", version="1.0.0", default_response_class=ORJSONResponse)
 
 # Neo4j connection settings
 NEO4J_URI = "bolt://localhost:7687"
@@ -34,6 +38,24 @@ def get_db_session():
     finally:
         session.close()
 
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+def etag_response(request: Request, content) -> Response:
+    """
+    Response tagged with a content hash; answers 304 when the client already has it.
+    Encodes as MessagePack when the client sends Accept: application/msgpack, JSON otherwise.
+    """
+    data = jsonable_encoder(content)
+    if MSGPACK_MEDIA_TYPE in request.headers.get("accept", ""):
+        body, media_type = msgpack.packb(data), MSGPACK_MEDIA_TYPE
+    else:
+        body, media_type = json.dumps(data).encode(), "application/json"
+
+    headers = {"ETag": f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"', "Vary": "Accept"}
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type=media_type, headers=headers)
+
 # Pydantic Models
 class RecordScoreRequest(BaseModel):
     player_number: int
@@ -115,10 +137,20 @@ class RecordTeamScoresRequest(BaseModel):
 
 class GenerateTeamCardRequest(BaseModel):
     team_number: int
+    include_qr_image: bool = True
+
+class GenerateTeamCardsRequest(BaseModel):
+    team_numbers: List[int]
+    include_qr_image: bool = True
 
 class GenerateHoleCardRequest(BaseModel):
     course_name: str
     hole_number: int
+    include_qr_image: bool = True
+
+class GenerateHoleCardsBatchRequest(BaseModel):
+    requests: List[GenerateHoleCardRequest]
+    include_qr_image: bool = True
 
 class QRCodeResponse(BaseModel):
     message: str
@@ -270,11 +302,12 @@ async def record_score(request: RecordScoreRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/team-leaderboard/{tournament_name}", response_model=List[TeamLeaderboardEntry])
-async def get_team_leaderboard(tournament_name: str):
+async def get_team_leaderboard(tournament_name: str, request: Request):
     """
     Given a Tournament name, returns the Team name, total, average, and rank values
     and the number of holes played for the active TeamRound in that Tournament,
-    ordered by rank descending.
+    ordered by rank descending. Supports If-None-Match revalidation via ETag
+    and MessagePack output via the Accept header.
     """
     try:
         with get_db_session() as session:
@@ -317,18 +350,19 @@ async def get_team_leaderboard(tournament_name: str):
                     completed=record["completed"]
                 ))
 
-            return leaderboard
+            return etag_response(request, leaderboard)
 
     except Exception as e:
         logger.error(f"Error getting team leaderboard: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/player-leaderboard/{tournament_name}", response_model=List[PlayerLeaderboardEntry])
-async def get_player_leaderboard(tournament_name: str):
+async def get_player_leaderboard(tournament_name: str, request: Request):
     """
     Given a Tournament name, returns the Player name, total, average, and rank values
     and the number of holes played for the active PlayerRound in that Tournament,
-    ordered by rank descending.
+    ordered by rank descending. Supports If-None-Match revalidation via ETag
+    and MessagePack output via the Accept header.
     """
     try:
         with get_db_session() as session:
@@ -369,7 +403,7 @@ async def get_player_leaderboard(tournament_name: str):
                     completed=record["completed"]
                 ))
 
-            return leaderboard
+            return etag_response(request, leaderboard)
 
     except Exception as e:
         logger.error(f"Error getting player leaderboard: {e}")
@@ -912,16 +946,7 @@ async def get_player_scorecard(request: PlayerScoreCardRequest):
         logger.error(f"Error retrieving player scores: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error retrieving player scores: {str(e)}")
 
-@app.post("/generate-team-card", response_model=QRCodeResponse)
-async def generate_team_card(request: GenerateTeamCardRequest):
-    """
-    Takes a team name and generates a QR code with the team information encoded into it.
-    """
-    try:
-        with get_db_session() as session:
-            # Get team information including players
-            team_query = """
-            MATCH (team:Team {number: $team_number})
+TEAM_CARD_RETURN = """
             OPTIONAL MATCH (p:Player)-[:MEMBER_OF]->(team)
             OPTIONAL MATCH (team)-[:PLAYED_ROUND]->(tr:TeamRound)
             OPTIONAL MATCH (tr)-[:IN_TOURNAMENT]->(t:Tournament)
@@ -942,6 +967,68 @@ async def generate_team_card(request: GenerateTeamCardRequest):
                    tournaments
             """
 
+def team_card_data(record):
+    """Team data encoded into a team card QR code"""
+    return {
+        "type": "team_card",
+        "team_name": record["team_name"],
+        "team_number": record["team_number"],
+        "players": [p for p in record["players"] if p["name"] is not None],
+        "tournaments": [t for t in record["tournaments"] if t["tournament_name"] is not None],
+        "generated_at": "2025-08-23T00:00:00Z"
+    }
+
+def team_card_qr(record, include_image: bool = True) -> QRCodeResponse:
+    """
+    Build the team card QR code response from a team query record.
+    With include_image=False the image is left empty for clients that draw the QR code themselves from encoded_data.
+    """
+    team_data = team_card_data(record)
+
+    if not include_image:
+        return QRCodeResponse(
+            message=f"Team data for team {team_data['team_number']}",
+            qr_code_base64="",
+            encoded_data=team_data
+        )
+
+    # Generate QR code
+    qr_data = json.dumps(team_data)
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=10,
+        border=4,
+    )
+    qr.add_data(qr_data)
+    qr.make(fit=True)
+
+    # Create QR code image
+    qr_image = qr.make_image(fill_color="black", back_color="white")
+
+    # Convert to base64
+    img_buffer = io.BytesIO()
+    qr_image.save(img_buffer, format='PNG')
+    qr_base64 = base64.b64encode(img_buffer.getvalue()).decode()
+
+    return QRCodeResponse(
+        message=f"QR code generated successfully for team {team_data['team_number']}",
+        qr_code_base64=qr_base64,
+        encoded_data=team_data
+    )
+
+@app.post("/generate-team-card", response_model=QRCodeResponse)
+async def generate_team_card(request: GenerateTeamCardRequest):
+    """
+    Takes a team name and generates a QR code with the team information encoded into it.
+    """
+    try:
+        with get_db_session() as session:
+            # Get team information including players
+            team_query = """
+            MATCH (team:Team {number: $team_number})
+            """ + TEAM_CARD_RETURN
+
             result = session.run(team_query, team_number=request.team_number)
             record = result.single()
 
@@ -951,41 +1038,7 @@ async def generate_team_card(request: GenerateTeamCardRequest):
                     detail=f"Team {request.team_number} not found"
                 )
 
-            # Prepare team data for QR code
-            team_data = {
-                "type": "team_card",
-                "team_name": record["team_name"],
-                "team_number": record["team_number"],
-                "players": [p for p in record["players"] if p["name"] is not None],
-                "tournaments": [t for t in record["tournaments"] if t["tournament_name"] is not None],
-                "generated_at": "2025-08-23T00:00:00Z"
-            }
-
-            # Generate QR code
-            qr_data = json.dumps(team_data)
-            qr = qrcode.QRCode(
-                version=1,
-                error_correction=qrcode.constants.ERROR_CORRECT_L,
-                box_size=10,
-                border=4,
-            )
-            qr.add_data(qr_data)
-            qr.make(fit=True)
-
-            # Create QR code image
-            qr_image = qr.make_image(fill_color="black", back_color="white")
-
-            # Convert to base64
-            img_buffer = io.BytesIO()
-            qr_image.save(img_buffer, format='PNG')
-            img_buffer.seek(0)
-            qr_base64 = base64.b64encode(img_buffer.getvalue()).decode()
-
-            return QRCodeResponse(
-                message=f"QR code generated successfully for team {request.team_number}",
-                qr_code_base64=qr_base64,
-                encoded_data=team_data
-            )
+            return team_card_qr(record, request.include_qr_image)
 
     except HTTPException:
         raise
@@ -993,16 +1046,7 @@ async def generate_team_card(request: GenerateTeamCardRequest):
         logger.error(f"Error generating team card: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/generate-hole-card", response_model=QRCodeResponse)
-async def generate_hole_card(request: GenerateHoleCardRequest):
-    """
-    Takes a course name and hole number and generates a QR code with the course and hole information encoded into it.
-    """
-    try:
-        with get_db_session() as session:
-            # Get hole and course information
-            hole_query = """
-            MATCH (c:Course {name: $course_name})-[:HAS_HOLE]->(h:Hole {number: $hole_number})
+HOLE_CARD_RETURN = """
             OPTIONAL MATCH (l:Location)-[:HAS_COURSE]->(c)
             OPTIONAL MATCH (t:Tournament)-[:USES]->(c)
             WITH c, h, l, collect(DISTINCT {
@@ -1018,6 +1062,80 @@ async def generate_hole_card(request: GenerateHoleCardRequest):
                    tournaments
             """
 
+def hole_card_data(record):
+    """Hole data encoded into a hole card QR code"""
+    return {
+        "type": "hole_card",
+        "course_name": record["course_name"],
+        "course_par": record["course_par"],
+        "hole_name": record["hole_name"],
+        "hole_number": record["hole_number"],
+        "hole_par": record["hole_par"],
+        "location_name": record["location_name"],
+        "tournaments": [t for t in record["tournaments"] if t["tournament_name"] is not None],
+        "generated_at": "2025-08-23T00:00:00Z"
+    }
+
+def hole_card_png(record):
+    """Build the hole card QR code PNG from a hole query record. Returns (png_bytes, hole_data)."""
+    hole_data = hole_card_data(record)
+
+    # Generate QR code
+    qr_data = json.dumps(hole_data)
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=10,
+        border=4,
+    )
+    qr.add_data(qr_data)
+    qr.make(fit=True)
+
+    # Create QR code image
+    qr_image = qr.make_image(fill_color="black", back_color="white")
+
+    img_buffer = io.BytesIO()
+    qr_image.save(img_buffer, format='PNG')
+    return img_buffer.getvalue(), hole_data
+
+def hole_card_qr(record, include_image: bool = True) -> QRCodeResponse:
+    """
+    Build the hole card QR code response from a hole query record.
+    With include_image=False the image is left empty for clients that draw the QR code themselves from encoded_data.
+    """
+    if not include_image:
+        hole_data = hole_card_data(record)
+        return QRCodeResponse(
+            message=f"Hole data for hole {hole_data['hole_number']} on {hole_data['course_name']}",
+            qr_code_base64="",
+            encoded_data=hole_data
+        )
+
+    png, hole_data = hole_card_png(record)
+
+    # Convert to base64
+    qr_base64 = base64.b64encode(png).decode()
+
+    return QRCodeResponse(
+        message=f"QR code generated successfully for hole {hole_data['hole_number']} on {hole_data['course_name']}",
+        qr_code_base64=qr_base64,
+        encoded_data=hole_data
+    )
+
+@app.post("/generate-hole-card", response_model=QRCodeResponse)
+async def generate_hole_card(request: GenerateHoleCardRequest, http_request: Request):
+    """
+    Takes a course name and hole number and generates a QR code with the course and hole information encoded into it.
+    Clients that send Accept: image/png get the PNG itself, with the encoded data as JSON in the X-Encoded-Data header.
+    With include_qr_image=False only the encoded data is returned, for clients that draw the QR code themselves.
+    """
+    try:
+        with get_db_session() as session:
+            # Get hole and course information
+            hole_query = """
+            MATCH (c:Course {name: $course_name})-[:HAS_HOLE]->(h:Hole {number: $hole_number})
+            """ + HOLE_CARD_RETURN
+
             result = session.run(hole_query, 
                                course_name=request.course_name,
                                hole_number=request.hole_number)
@@ -1029,44 +1147,15 @@ async def generate_hole_card(request: GenerateHoleCardRequest):
                     detail=f"Hole {request.hole_number} not found on course {request.course_name}"
                 )
 
-            # Prepare hole data for QR code
-            hole_data = {
-                "type": "hole_card",
-                "course_name": record["course_name"],
-                "course_par": record["course_par"],
-                "hole_name": record["hole_name"],
-                "hole_number": record["hole_number"],
-                "hole_par": record["hole_par"],
-                "location_name": record["location_name"],
-                "tournaments": [t for t in record["tournaments"] if t["tournament_name"] is not None],
-                "generated_at": "2025-08-23T00:00:00Z"
-            }
+            if not request.include_qr_image:
+                return hole_card_qr(record, False)
 
-            # Generate QR code
-            qr_data = json.dumps(hole_data)
-            qr = qrcode.QRCode(
-                version=1,
-                error_correction=qrcode.constants.ERROR_CORRECT_L,
-                box_size=10,
-                border=4,
-            )
-            qr.add_data(qr_data)
-            qr.make(fit=True)
-
-            # Create QR code image
-            qr_image = qr.make_image(fill_color="black", back_color="white")
-
-            # Convert to base64
-            img_buffer = io.BytesIO()
-            qr_image.save(img_buffer, format='PNG')
-            img_buffer.seek(0)
-            qr_base64 = base64.b64encode(img_buffer.getvalue()).decode()
-
-            return QRCodeResponse(
-                message=f"QR code generated successfully for hole {request.hole_number} on {request.course_name}",
-                qr_code_base64=qr_base64,
-                encoded_data=hole_data
-            )
+            if "image/png" in http_request.headers.get("accept", ""):
+                png, hole_data = hole_card_png(record)
+                return Response(content=png, media_type="image/png",
+                                headers={"X-Encoded-Data": json.dumps(hole_data)})
+
+            return hole_card_qr(record)
 
     except HTTPException:
         raise
@@ -1074,6 +1163,46 @@ async def generate_hole_card(request: GenerateHoleCardRequest):
         logger.error(f"Error generating hole card: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/generate-hole-cards-batch", response_model=List[QRCodeResponse])
+async def generate_hole_cards_batch(request: GenerateHoleCardsBatchRequest):
+    """
+    Batch form of /generate-hole-card: one query and one response for many (course name, hole number) pairs.
+    Holes that don't exist are left out of the result.
+    """
+    try:
+        with get_db_session() as session:
+            hole_query = """
+            UNWIND $holes as hole
+            MATCH (c:Course {name: hole.course_name})-[:HAS_HOLE]->(h:Hole {number: hole.hole_number})
+            """ + HOLE_CARD_RETURN
+
+            result = session.run(hole_query, holes=[item.dict() for item in request.requests])
+            return [hole_card_qr(record, request.include_qr_image) for record in result]
+
+    except Exception as e:
+        logger.error(f"Error generating hole cards: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/generate-team-cards", response_model=List[QRCodeResponse])
+async def generate_team_cards(request: GenerateTeamCardsRequest):
+    """
+    Bulk form of /generate-team-card: one query and one response for many team numbers.
+    Teams that don't exist are left out of the result.
+    """
+    try:
+        with get_db_session() as session:
+            team_query = """
+            UNWIND $team_numbers as team_number
+            MATCH (team:Team {number: team_number})
+            """ + TEAM_CARD_RETURN
+
+            result = session.run(team_query, team_numbers=request.team_numbers)
+            return [team_card_qr(record, request.include_qr_image) for record in result]
+
+    except Exception as e:
+        logger.error(f"Error generating team cards: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():